@@ -3,20 +3,27 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import shlex
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 from ..common.env import load_repo_dotenv
 from ..common.batching import ensure_timestamp_suffix, utc_now
+from ..common.io import loads
 from ..common.logging import setup_logging
-from .evaluation.run_evaluation import run_evaluation as run_evaluation_impl
+from .evaluation.run_evaluation import default_workers, run_evaluation as run_evaluation_impl
 from .pipeline.oneshot import run as run_oneshot
 
+try:  # optional dependency: incremental JSON parsing
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_DATASET = REPO_ROOT / "dataset" / "article2unit2structure" / "normbench_v1.json"
@@ -24,6 +31,9 @@ DEFAULT_RUNS_ROOT = Path(__file__).resolve().parent / "runs"
 
 
 def _progress() -> Progress:
+    # Imported here so `evaluate` and `--help` do not pay for loading rich.
+    from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn, TimeRemainingColumn
+
     return Progress(
         TextColumn("{task.description}", justify="left"),
         BarColumn(),
@@ -32,6 +42,7 @@ def _progress() -> Progress:
         TimeElapsedColumn(),
         TextColumn("ETA"),
         TimeRemainingColumn(),
+        refresh_per_second=4,
     )
 
 
@@ -73,6 +84,11 @@ def _build_invocation(args: argparse.Namespace, *, effective_args: Dict[str, Any
     }
 
 
+def _abspath(path: str) -> Path:
+    # Lexical normalization only: cheaper than Path.resolve() (no per-component symlink lookups).
+    return Path(os.path.abspath(path))
+
+
 def _resolve_runs_dir(path: Optional[str]) -> Path:
     return Path(path) if path else DEFAULT_RUNS_ROOT
 
@@ -84,7 +100,7 @@ def cmd_run(args: argparse.Namespace) -> None:
     log_dir = runs_dir / batch_id / "logs"
     setup_logging(log_dir)
 
-    dataset_path = Path(args.input_path).resolve()
+    dataset_path = _abspath(args.input_path)
 
     invocation = _build_invocation(
         args,
@@ -138,51 +154,64 @@ def _resolve_predictions_from_run_dir(run_dir: Path) -> Path:
     raise FileNotFoundError(f"structured_units.json not found under: {run_dir}")
 
 
+def _iter_item_fields(path: Path, keys: tuple[str, ...]) -> Iterator[Dict[str, str]]:
+    """Yield the string-valued `keys` of each top-level dict in a JSON array file.
+
+    With ijson installed the file is scanned incrementally and only the requested
+    fields are materialized; otherwise the whole document is parsed.
+    """
+    if ijson is None:
+        payload = loads(path.read_bytes())
+        if not isinstance(payload, list):
+            return
+        for r in payload:
+            if isinstance(r, dict):
+                yield {k: v for k in keys if isinstance(v := r.get(k), str)}
+        return
+
+    wanted = {f"item.{k}": k for k in keys}
+    fields: Dict[str, str] = {}
+    with path.open("rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "item":
+                if event == "start_map":
+                    fields = {}
+                elif event == "end_map":
+                    yield fields
+            elif event == "string" and prefix in wanted:
+                fields[wanted[prefix]] = value
+
+
 def _load_rule_ids_from_units_json(units_path: Path) -> list[str]:
     if not units_path.exists():
         return []
-    payload = json.loads(units_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, list):
-        return []
     out: list[str] = []
-    for r in payload:
-        if not isinstance(r, dict):
-            continue
+    for r in _iter_item_fields(units_path, ("rule_id",)):
         rid = r.get("rule_id")
-        if isinstance(rid, str) and rid.strip():
+        if rid and rid.strip():
             out.append(rid.rstrip("|").strip())
     return out
 
 
 def _load_rule_ids_from_predictions(predictions_path: Path) -> list[str]:
-    payload = json.loads(predictions_path.read_text(encoding="utf-8"))
-    if not isinstance(payload, list):
-        return []
-    out: list[str] = []
-    for r in payload:
-        if not isinstance(r, dict):
-            continue
+    # Insertion-ordered dict: normalize and de-dup in one pass.
+    seen: dict[str, None] = {}
+    for r in _iter_item_fields(predictions_path, ("rule_id", "unit_key")):
         rid = r.get("rule_id")
-        if not (isinstance(rid, str) and rid.strip()):
+        if not (rid and rid.strip()):
             uk = r.get("unit_key")
-            if isinstance(uk, str) and "#" in uk:
-                rid = uk.split("#", 1)[0]
-        if isinstance(rid, str) and rid.strip():
-            out.append(rid.rstrip("|").strip())
-    # De-dup while keeping order (small lists anyway).
-    seen: set[str] = set()
-    uniq: list[str] = []
-    for x in out:
-        if x in seen:
-            continue
-        seen.add(x)
-        uniq.append(x)
-    return uniq
+            if uk is not None:
+                pos = uk.find("#")
+                if pos >= 0:
+                    rid = uk[:pos]
+        if rid and rid.strip():
+            seen.setdefault(rid.rstrip("|").strip(), None)
+    return list(seen)
 
 
 def cmd_evaluate(args: argparse.Namespace) -> None:
-    run_dir = Path(args.run_dir).resolve()
-    dataset_path = Path(args.dataset).resolve()
+    run_dir = _abspath(args.run_dir)
+    dataset_path = _abspath(args.dataset)
 
     # Match the internal runner: output under run_dir/<eval_subdir>/.
     setup_logging(run_dir / str(args.eval_subdir) / "logs")
@@ -191,7 +220,7 @@ def cmd_evaluate(args: argparse.Namespace) -> None:
         run_root=run_dir,
         dataset_path=dataset_path,
         stage=args.stage,
-        structured_path=Path(args.structured_path).resolve() if args.structured_path else None,
+        structured_path=_abspath(args.structured_path) if args.structured_path else None,
         limit=args.limit,
         sample_frac=args.sample_frac,
         sample_seed=args.sample_seed,
@@ -199,9 +228,10 @@ def cmd_evaluate(args: argparse.Namespace) -> None:
         strict_schema=bool(args.strict_schema),
         iou_threshold=float(args.iou_threshold),
         auto_fix_structured=bool(args.auto_fix_structured),
-        fixed_structured_path=Path(args.fixed_structured_path).resolve() if args.fixed_structured_path else None,
+        fixed_structured_path=_abspath(args.fixed_structured_path) if args.fixed_structured_path else None,
         eval_subdir=str(args.eval_subdir),
         subset_mode=str(args.subset_mode),
+        workers=args.workers if args.workers is not None else default_workers(),
     )
 
 
@@ -249,6 +279,7 @@ def build_parser() -> argparse.ArgumentParser:
         default="auto",
         help="filter gold to run subset (auto uses units.json then manifest)",
     )
+    peval.add_argument("--workers", type=int, default=None, help="scoring processes (default: available CPUs, at most 32; 1 = sequential)")
     peval.set_defaults(func=cmd_evaluate)
 
     return p
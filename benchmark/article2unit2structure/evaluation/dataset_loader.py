@@ -23,10 +23,13 @@ It supports the released NormBench dataset format:
 from __future__ import annotations
 
 import hashlib
-import json
+import heapq
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+from ...common.io import dumps, loads
 
 
 @dataclass(frozen=True)
@@ -53,12 +56,13 @@ class Stage2Dataset:
     samples: List[Stage2Sample]
 
 
+# The payload is decoded JSON (plain dicts/lists only), so exact type checks suffice.
 def _as_dict(v: Any) -> Dict[str, Any]:
-    return v if isinstance(v, dict) else {}
+    return v if type(v) is dict else {}
 
 
 def _as_list(v: Any) -> List[Any]:
-    return v if isinstance(v, list) else []
+    return v if type(v) is list else []
 
 
 def _normalize_rule_id(rule_id: str) -> str:
@@ -77,34 +81,23 @@ def _select_fraction(samples: List[Stage2Sample], *, frac: float, seed: str) ->
     if n >= len(samples):
         return samples
 
-    def score(s: Stage2Sample) -> str:
-        return hashlib.sha256(f"{seed}|{s.sample_id}".encode("utf-8")).hexdigest()
-
-    ranked = sorted(samples, key=score)
-    return ranked[:n]
+    # Rank by sha256(f"{seed}|{sample_id}") so a given seed keeps selecting the same subset.
+    # Raw digests order like their hex form; nsmallest is O(N log n) and tie-stable like sorted().
+    prefix = hashlib.sha256(f"{seed}|".encode("utf-8"))
 
+    def score(s: Stage2Sample) -> bytes:
+        h = prefix.copy()
+        h.update(s.sample_id.encode("utf-8"))
+        return h.digest()
 
-def load_stage2_dataset(
-    path: Path,
-    *,
-    limit: Optional[int] = None,
-    usable_only: bool = True,
-    sample_frac: Optional[float] = None,
-    sample_seed: str = "0",
-) -> Stage2Dataset:
-    dataset_path = path if path.is_absolute() else Path.cwd() / path
-    payload = json.loads(dataset_path.read_text(encoding="utf-8"))
+    return heapq.nsmallest(n, samples, key=score)
 
-    if not isinstance(payload, dict) or "items" not in payload:
-        raise ValueError(f"Unsupported dataset format (missing top-level 'items'): {dataset_path}")
 
-    dataset_format_version = str(payload.get("format_version") or "")
-    generated_at = str(payload.get("created_at") or "")
-    batch_id = str(payload.get("dataset_id") or "")
+def _iter_samples(items: List[Any], *, usable_only: bool) -> Iterator[Stage2Sample]:
+    """Yield one Stage2Sample per gold unit, in dataset order."""
 
-    samples: List[Stage2Sample] = []
-    for it in _as_list(payload.get("items")):
-        if not isinstance(it, dict):
+    for it in items:
+        if type(it) is not dict:
             continue
         inp = _as_dict(it.get("input"))
         gold = _as_dict(it.get("gold"))
@@ -116,8 +109,31 @@ def load_stage2_dataset(
         rule_text = str(inp.get("rule_text") or "")
         full_article_text = str(inp.get("full_article_text") or "")
 
+        # Article-level fields are identical for every unit: build them once per item.
+        # `meta` is read-only downstream, so all units of the article share one dict.
+        gold_head: Dict[str, Any] = {
+            "schema_version": "st2.v3",
+            "rule_id": rid_norm,
+            "law_title": law_title,
+            "article_number": article_number,
+            "rule_text": rule_text,
+        }
+        input_head: Dict[str, Any] = {
+            "rule_id": rid_norm,
+            "law_title": law_title,
+            "article_number": article_number,
+            "rule_text": rule_text,
+            "full_article_text": full_article_text,
+        }
+        meta: Dict[str, Any] = {
+            "full_article_text": full_article_text,
+            "language": it.get("language"),
+            "subset": it.get("subset"),
+            "source_type": it.get("source_type"),
+        }
+
         for u in _as_list(gold.get("units")):
-            if not isinstance(u, dict):
+            if type(u) is not dict:
                 continue
             unit_id = str(u.get("unit_id") or "")
             unit_key = f"{rid_norm}#{unit_id}" if rid_norm and unit_id else ""
@@ -128,58 +144,70 @@ def load_stage2_dataset(
             if usable_only and not usable:
                 continue
 
+            unit_text = str(u.get("unit_text") or "")
+            unit_reason = str(u.get("unit_reason") or "")
+            branches = u.get("branches")
+            unit_meta = u.get("meta")
             gold_obj: Dict[str, Any] = {
-                "schema_version": "st2.v3",
-                "rule_id": rid_norm,
-                "law_title": law_title,
-                "article_number": article_number,
-                "rule_text": rule_text,
+                **gold_head,
                 "unit_id": unit_id,
-                "unit_text": str(u.get("unit_text") or ""),
-                "unit_reason": str(u.get("unit_reason") or ""),
-                "branches": u.get("branches") if isinstance(u.get("branches"), list) else [],
-                "meta": u.get("meta") if isinstance(u.get("meta"), dict) else {},
-            }
-
-            meta: Dict[str, Any] = {
-                "full_article_text": full_article_text,
-                "language": it.get("language"),
-                "subset": it.get("subset"),
-                "source_type": it.get("source_type"),
+                "unit_text": unit_text,
+                "unit_reason": unit_reason,
+                "branches": branches if type(branches) is list else [],
+                "meta": unit_meta if type(unit_meta) is dict else {},
             }
 
             # The evaluator does not require prompt reconstruction; keep placeholders for compatibility.
             input_obj = {
-                "rule_id": rid_norm,
-                "law_title": law_title,
-                "article_number": article_number,
-                "rule_text": rule_text,
-                "full_article_text": full_article_text,
+                **input_head,
                 "unit_id": unit_id,
-                "unit_text": gold_obj["unit_text"],
-                "unit_reason": gold_obj["unit_reason"],
+                "unit_text": unit_text,
+                "unit_reason": unit_reason,
             }
-            input_prompt = json.dumps(input_obj, ensure_ascii=False, indent=2)
+            input_prompt = dumps(input_obj, indent=2)
             input_messages = [{"role": "user", "content": input_prompt}]
 
-            samples.append(
-                Stage2Sample(
-                    sample_id=sample_id,
-                    unit_key=unit_key,
-                    rule_id=rid_norm,
-                    unit_id=unit_id,
-                    input_prompt=input_prompt,
-                    input_messages=input_messages,
-                    gold_obj=gold_obj,
-                    gold_quality={"usable": True},
-                    meta=meta,
-                )
+            yield Stage2Sample(
+                sample_id=sample_id,
+                unit_key=unit_key,
+                rule_id=rid_norm,
+                unit_id=unit_id,
+                input_prompt=input_prompt,
+                input_messages=input_messages,
+                gold_obj=gold_obj,
+                gold_quality={"usable": True},
+                meta=meta,
             )
 
-    if sample_frac is not None:
-        samples = _select_fraction(samples, frac=float(sample_frac), seed=str(sample_seed))
-    if limit is not None:
-        samples = samples[: int(limit)]
+
+def load_stage2_dataset(
+    path: Path,
+    *,
+    limit: Optional[int] = None,
+    usable_only: bool = True,
+    sample_frac: Optional[float] = None,
+    sample_seed: str = "0",
+) -> Stage2Dataset:
+    dataset_path = path if path.is_absolute() else Path.cwd() / path
+    payload = loads(dataset_path.read_bytes())
+
+    if type(payload) is not dict or "items" not in payload:
+        raise ValueError(f"Unsupported dataset format (missing top-level 'items'): {dataset_path}")
+
+    dataset_format_version = str(payload.get("format_version") or "")
+    generated_at = str(payload.get("created_at") or "")
+    batch_id = str(payload.get("dataset_id") or "")
+
+    sample_iter = _iter_samples(_as_list(payload.get("items")), usable_only=usable_only)
+    if sample_frac is None and limit is not None and int(limit) >= 0:
+        # Plain prefix: stop building samples once `limit` is reached.
+        samples = list(islice(sample_iter, int(limit)))
+    else:
+        samples = list(sample_iter)
+        if sample_frac is not None:
+            samples = _select_fraction(samples, frac=float(sample_frac), seed=str(sample_seed))
+        if limit is not None:
+            samples = samples[: int(limit)]
 
     return Stage2Dataset(
         dataset_path=dataset_path,
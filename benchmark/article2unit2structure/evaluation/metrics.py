@@ -13,19 +13,24 @@ Strict scoring: invalid predictions receive structure scores of 0.
 from __future__ import annotations
 
 import hashlib
-import re
+import sys
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 
+# Leaf/effect/anchor texts recur across branches and between gold and prediction.
+@lru_cache(maxsize=65536)
 def _norm_text(text: str) -> str:
-    t = (text or "").strip()
-    t = re.sub(r"\s+", " ", t)
-    return t
+    # Same as stripping and collapsing `\s+` runs (str.split uses the same whitespace set), without regex.
+    return " ".join((text or "").split())
 
 
-def _sha1(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8")).hexdigest()  # noqa: S324 - non-crypto use (stable signature)
+@lru_cache(maxsize=65536)
+def _digest(text: str) -> str:
+    # Non-crypto use (stable in-run signature); blake2b is cheaper than sha1 on short keys.
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
 
 
 Edge = Tuple[str, str, str]
@@ -33,45 +38,53 @@ Edge = Tuple[str, str, str]
 
 @dataclass(frozen=True)
 class Graph:
-    nodes: Set[str]
-    edges: Set[Edge]
+    nodes: AbstractSet[str]
+    edges: AbstractSet[Edge]
+    # Span-bearing subset of `nodes` (leaves + effects). `build_graph` records it as nodes are
+    # added; when omitted it is derived from `nodes`.
+    span_nodes: Optional[AbstractSet[str]] = None
 
+    def __post_init__(self) -> None:
+        if self.span_nodes is None:
+            object.__setattr__(self, "span_nodes", frozenset(n for n in self.nodes if _is_span_node(n)))
 
+
+def _is_span_node(sig: str) -> bool:
+    # Span-bearing nodes in our canonicalization.
+    return sig.startswith("LEAF|") or sig.startswith("EFFECT|")
+
+
+# Signatures are interned: they recur across branches and samples, and interned copies make
+# set/edge-tuple comparisons between gold and prediction graphs identity checks.
 def _leaf_sig(leaf: Dict[str, Any]) -> str:
-    return f"LEAF|{_norm_text(str(leaf.get('tag', '')))}|{_norm_text(str(leaf.get('text', '')))}"
+    return sys.intern(f"LEAF|{_norm_text(str(leaf.get('tag', '')))}|{_norm_text(str(leaf.get('text', '')))}")
 
 
 def _effect_sig(effect: Dict[str, Any]) -> str:
-    return f"EFFECT|{_norm_text(str(effect.get('effect_text', '')))}"
+    return sys.intern(f"EFFECT|{_norm_text(str(effect.get('effect_text', '')))}")
 
 
 def _anchor_sig(anchor: Any) -> str:
-    if not isinstance(anchor, dict):
+    if type(anchor) is not dict:
         return "ANCH||0"
     text = _norm_text(str(anchor.get("text", "")))
     occ = anchor.get("occurrence")
     occ_s = str(occ) if isinstance(occ, int) else "0"
-    return f"ANCH|{text}|{occ_s}"
+    return sys.intern(f"ANCH|{text}|{occ_s}")
 
 
 def _modality_sig(norm_kind: Any) -> str:
     # The paper refers to modality kappa; our schema uses norm_kind (e.g., obligation/permission/prohibition).
-    return f"MODAL|{_norm_text(str(norm_kind or ''))}"
+    return sys.intern(f"MODAL|{_norm_text(str(norm_kind or ''))}")
 
 
-def _op_sig(node: Dict[str, Any]) -> str:
-    op = str(node.get("op", "")).upper()
-    items = node.get("items") or []
-    child_sigs: List[str] = []
-    for it in items:
-        if not isinstance(it, dict):
-            continue
-        if "op" in it and "items" in it:
-            child_sigs.append(_op_sig(it))
-        else:
-            child_sigs.append(_leaf_sig(it))
+def _is_op_node(node: Dict[str, Any]) -> bool:
+    return "op" in node and "items" in node
+
+
+def _op_sig_from_children(op: str, child_sigs: List[str]) -> str:
     key = op + "\n" + "\n".join(sorted(child_sigs))
-    return f"OP|{op}|{_sha1(key)}"
+    return sys.intern(f"OP|{op}|{_digest(key)}")
 
 
 def _collect_condition_graph(
@@ -79,40 +92,62 @@ def _collect_condition_graph(
     *,
     nodes: Set[str],
     edges: Set[Edge],
+    span_nodes: Set[str],
 ) -> str:
-    """Collect nodes/edges for the condition tree, return root signature."""
+    """Collect nodes/edges for the condition tree, return root signature.
 
-    root_sig = _op_sig(node)
-    nodes.add(root_sig)
-    items = node.get("items") or []
-    for it in items:
-        if not isinstance(it, dict):
+    Iterative post-order walk: every op node is signed once, from the signatures of its
+    children, so deep trees neither recurse nor get re-hashed at each ancestor.
+    """
+
+    sig_of: Dict[int, str] = {}
+    stack: List[Tuple[Dict[str, Any], bool]] = [(node, False)]
+    while stack:
+        cur, children_done = stack.pop()
+        items = [it for it in (cur.get("items") or []) if type(it) is dict]
+        if not children_done:
+            stack.append((cur, True))
+            stack.extend((it, False) for it in items if _is_op_node(it))
             continue
-        if "op" in it and "items" in it:
-            child_root = _collect_condition_graph(it, nodes=nodes, edges=edges)
-            edges.add(("COND_CHILD", root_sig, child_root))
-        else:
-            leaf = _leaf_sig(it)
-            nodes.add(leaf)
-            edges.add(("COND_CHILD", root_sig, leaf))
-    return root_sig
+
+        op = str(cur.get("op", "")).upper()
+        child_sigs: List[str] = []
+        for it in items:
+            if _is_op_node(it):
+                child_sigs.append(sig_of[id(it)])
+            else:
+                leaf = _leaf_sig(it)
+                span_nodes.add(leaf)
+                child_sigs.append(leaf)
+        sig = _op_sig_from_children(op, child_sigs)
+        sig_of[id(cur)] = sig
+        nodes.add(sig)
+        for child in child_sigs:
+            nodes.add(child)
+            edges.add(("COND_CHILD", sig, child))
+    return sig_of[id(node)]
 
 
 def build_graph(obj: Dict[str, Any]) -> Graph:
-    """Build a canonical graph from a Stage2 structured output (parsed JSON dict)."""
+    """Build a canonical graph from a Stage2 structured output (parsed JSON dict).
+
+    JSON decoding only yields plain dicts/lists, so the walkers below use exact `type()`
+    checks rather than `isinstance`.
+    """
 
     nodes: Set[str] = set()
     edges: Set[Edge] = set()
+    span_nodes: Set[str] = set()
 
     branches = obj.get("branches")
-    if not isinstance(branches, list):
-        return Graph(nodes=set(), edges=set())
+    if type(branches) is not list:
+        return Graph(nodes=set(), edges=set(), span_nodes=set())
 
     for b in branches:
-        if not isinstance(b, dict):
+        if type(b) is not dict:
             continue
         cond = b.get("conditions")
-        if not isinstance(cond, dict):
+        if type(cond) is not dict:
             continue
 
         # Anchor + modality (paper: alpha + kappa)
@@ -123,21 +158,22 @@ def build_graph(obj: Dict[str, Any]) -> Graph:
         edges.add(("MOD", anch, modal))
 
         # Condition tree
-        cond_root_sig = _collect_condition_graph(cond, nodes=nodes, edges=edges)
+        cond_root_sig = _collect_condition_graph(cond, nodes=nodes, edges=edges, span_nodes=span_nodes)
         # Tie the condition tree to the branch via modality. Without this, the unioned edge set can
         # ambiguously merge identical condition subtrees across branches.
         edges.add(("COND_ROOT", modal, cond_root_sig))
 
         # Effects
-        effects = b.get("effects") if isinstance(b.get("effects"), list) else []
+        effects = b.get("effects") if type(b.get("effects")) is list else []
         for eff in effects:
-            if not isinstance(eff, dict):
+            if type(eff) is not dict:
                 continue
             sig = _effect_sig(eff)
             nodes.add(sig)
+            span_nodes.add(sig)
             edges.add(("ANCH_EFFECT", anch, sig))
 
-    return Graph(nodes=nodes, edges=edges)
+    return Graph(nodes=nodes, edges=edges, span_nodes=span_nodes)
 
 
 @dataclass(frozen=True)
@@ -150,27 +186,28 @@ class EdgeF1:
     gold_edges: int
 
 
-def edge_f1(gold_edges: Iterable[Edge], pred_edges: Iterable[Edge]) -> EdgeF1:
-    gold_set = set(gold_edges)
-    pred_set = set(pred_edges)
-    inter = gold_set & pred_set
+def _as_set(values: Iterable[Any]) -> AbstractSet[Any]:
+    # `Graph` fields are already sets; only materialize generic iterables.
+    return values if isinstance(values, (set, frozenset)) else set(values)
 
-    tp = len(inter)
-    pe = len(pred_set)
-    ge = len(gold_set)
 
-    if pe == 0:
-        precision = 1.0 if ge == 0 else 0.0
+def _prf(tp: int, n_pred: int, n_gold: int) -> Tuple[float, float, float]:
+    if n_pred == 0:
+        precision = 1.0 if n_gold == 0 else 0.0
     else:
-        precision = tp / pe
+        precision = tp / n_pred
 
-    recall = 1.0 if ge == 0 else (tp / ge)
+    recall = 1.0 if n_gold == 0 else (tp / n_gold)
 
     if precision + recall == 0:
         f1 = 0.0
     else:
         f1 = 2 * precision * recall / (precision + recall)
+    return precision, recall, f1
 
+
+def _edge_f1_from_counts(tp: int, pe: int, ge: int) -> EdgeF1:
+    precision, recall, f1 = _prf(tp, pe, ge)
     return EdgeF1(
         precision=precision,
         recall=recall,
@@ -181,7 +218,18 @@ def edge_f1(gold_edges: Iterable[Edge], pred_edges: Iterable[Edge]) -> EdgeF1:
     )
 
 
+def edge_f1(gold_edges: Iterable[Edge], pred_edges: Iterable[Edge]) -> EdgeF1:
+    gold_set = _as_set(gold_edges)
+    pred_set = _as_set(pred_edges)
+
+    # set.__and__ probes from the smaller operand.
+    return _edge_f1_from_counts(len(gold_set & pred_set), len(pred_set), len(gold_set))
+
+
 def tree_em(gold: Graph, pred: Graph) -> float:
+    # Compare both cardinalities before any element-wise set comparison.
+    if len(gold.nodes) != len(pred.nodes) or len(gold.edges) != len(pred.edges):
+        return 0.0
     return 1.0 if (gold.nodes == pred.nodes and gold.edges == pred.edges) else 0.0
 
 
@@ -195,9 +243,9 @@ class NodeF1:
     gold: int
 
 
-def _is_span_node(sig: str) -> bool:
-    # Span-bearing nodes in our canonicalization.
-    return sig.startswith("LEAF|") or sig.startswith("EFFECT|")
+def _node_f1_from_counts(tp: int, pn: int, gn: int) -> NodeF1:
+    precision, recall, f1 = _prf(tp, pn, gn)
+    return NodeF1(precision=float(precision), recall=float(recall), f1=float(f1), tp=tp, pred=pn, gold=gn)
 
 
 def node_span_f1(gold_nodes: Iterable[str], pred_nodes: Iterable[str]) -> NodeF1:
@@ -207,27 +255,17 @@ def node_span_f1(gold_nodes: Iterable[str], pred_nodes: Iterable[str]) -> NodeF1
     so we approximate with deterministic node signatures (tag/text for leaves, effect_text for effects).
     """
 
-    gold_set = {n for n in set(gold_nodes) if _is_span_node(n)}
-    pred_set = {n for n in set(pred_nodes) if _is_span_node(n)}
-    inter = gold_set & pred_set
-
-    tp = len(inter)
-    pn = len(pred_set)
-    gn = len(gold_set)
-
-    if pn == 0:
-        precision = 1.0 if gn == 0 else 0.0
-    else:
-        precision = tp / pn
-
-    recall = 1.0 if gn == 0 else (tp / gn)
+    gold_set = {n for n in _as_set(gold_nodes) if _is_span_node(n)}
+    pred_set = {n for n in _as_set(pred_nodes) if _is_span_node(n)}
+    return _node_f1_from_counts(len(gold_set & pred_set), len(pred_set), len(gold_set))
 
-    if precision + recall == 0:
-        f1 = 0.0
-    else:
-        f1 = 2 * precision * recall / (precision + recall)
 
-    return NodeF1(precision=float(precision), recall=float(recall), f1=float(f1), tp=tp, pred=pn, gold=gn)
+def _nted_from_counts(*, gn: int, ge: int, pn: int, pe: int, node_tp: int, edge_tp: int) -> float:
+    # |A ^ B| == |A| + |B| - 2|A & B|; avoids materializing the symmetric difference.
+    node_edits = gn + pn - 2 * node_tp
+    edge_edits = ge + pe - 2 * edge_tp
+    denom = max(1, gn + ge + pn + pe)
+    return float((node_edits + edge_edits) / denom)
 
 
 def nted(gold: Graph, pred: Graph) -> float:
@@ -240,36 +278,70 @@ def nted(gold: Graph, pred: Graph) -> float:
       nTED = (NodeEdits + EdgeEdits) / (|V_gold| + |E_gold| + |V_pred| + |E_pred|).
     """
 
-    node_edits = len(gold.nodes ^ pred.nodes)
-    edge_edits = len(gold.edges ^ pred.edges)
-    denom = max(1, len(gold.nodes) + len(gold.edges) + len(pred.nodes) + len(pred.edges))
-    return float((node_edits + edge_edits) / denom)
+    return _nted_from_counts(
+        gn=len(gold.nodes),
+        ge=len(gold.edges),
+        pn=len(pred.nodes),
+        pe=len(pred.edges),
+        node_tp=len(gold.nodes & pred.nodes),
+        edge_tp=len(gold.edges & pred.edges),
+    )
+
+
+@dataclass(frozen=True)
+class PairScores:
+    edge: EdgeF1
+    node: NodeF1
+    tree_em: float
+    nted: float
+
+
+def score_pair(gold: Graph, pred: Graph) -> PairScores:
+    """Edge-F1, NodeSpan-F1, Tree-EM and nTED from one intersection per node/edge set.
+
+    Equivalent to calling `edge_f1`, `node_span_f1`, `tree_em` and `nted` separately.
+    """
+
+    gn, ge, gs = len(gold.nodes), len(gold.edges), len(gold.span_nodes)
+    pn, pe, ps = len(pred.nodes), len(pred.edges), len(pred.span_nodes)
+    node_tp = len(gold.nodes & pred.nodes)
+    edge_tp = len(gold.edges & pred.edges)
+    span_tp = len(gold.span_nodes & pred.span_nodes)
+
+    # Two finite sets are equal iff both have the size of their intersection.
+    em = 1.0 if (gn == pn == node_tp and ge == pe == edge_tp) else 0.0
+    return PairScores(
+        edge=_edge_f1_from_counts(edge_tp, pe, ge),
+        node=_node_f1_from_counts(span_tp, ps, gs),
+        tree_em=em,
+        nted=_nted_from_counts(gn=gn, ge=ge, pn=pn, pe=pe, node_tp=node_tp, edge_tp=edge_tp),
+    )
 
 
 def _iter_span_texts(obj: Dict[str, Any]) -> Iterable[str]:
     branches = obj.get("branches")
-    if not isinstance(branches, list):
+    if type(branches) is not list:
         return
     for b in branches:
-        if not isinstance(b, dict):
+        if type(b) is not dict:
             continue
         cond = b.get("conditions")
         yield from _iter_condition_leaf_texts(cond)
-        effects = b.get("effects") if isinstance(b.get("effects"), list) else []
+        effects = b.get("effects") if type(b.get("effects")) is list else []
         for eff in effects:
-            if isinstance(eff, dict) and isinstance(eff.get("effect_text"), str):
+            if type(eff) is dict and isinstance(eff.get("effect_text"), str):
                 yield eff["effect_text"]
 
 
 def _iter_condition_leaf_texts(node: Any) -> Iterable[str]:
-    if isinstance(node, dict):
+    if type(node) is dict:
         if "leaf_id" in node and "tag" in node and "text" in node:
             if isinstance(node.get("text"), str):
                 yield node["text"]
             return
         for v in node.values():
             yield from _iter_condition_leaf_texts(v)
-    elif isinstance(node, list):
+    elif type(node) is list:
         for v in node:
             yield from _iter_condition_leaf_texts(v)
 
@@ -282,18 +354,17 @@ def span_audit_metrics(pred_obj: Dict[str, Any], *, input_text: str) -> Tuple[fl
     - Halluc: fraction of predicted span texts that do NOT appear in the input provision text.
     """
 
-    in_norm = _norm_text(input_text or "")
-    texts = [t for t in _iter_span_texts(pred_obj) if isinstance(t, str)]
+    # `_iter_span_texts` only yields strings.
+    texts = list(_iter_span_texts(pred_obj))
     if not texts:
         return 0.0, 0.0
+    # The input text is unique per sample: normalize it without going through (and evicting) the
+    # shared `_norm_text` cache.
+    in_norm = " ".join((input_text or "").split())
 
-    faithful = 0
-    for t in texts:
-        t_norm = _norm_text(t)
-        if not t_norm:
-            continue
-        if t_norm in in_norm:
-            faithful += 1
+    # Predicted spans repeat across branches (shared subjects/conditions); search each distinct one once.
+    counts = Counter(_norm_text(t) for t in texts)
+    faithful = sum(c for t_norm, c in counts.items() if t_norm and t_norm in in_norm)
     total = len(texts)
     span_faith = faithful / total if total else 0.0
     halluc = (total - faithful) / total if total else 0.0
@@ -12,23 +12,24 @@ st2.v3 schema, including:
 from __future__ import annotations
 
 import argparse
-import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from ...common.io import read_json, write_json
+from ...common.io import jsonl_line, read_json, write_json
 from ...common.logging import get_logger, setup_logging
 from ..scripts.fix_structured_units import fix_structured_units
-from .dataset_loader import load_stage2_dataset
+from .dataset_loader import Stage2Sample, load_stage2_dataset
 from .metrics import (
     Graph,
     build_graph,
-    edge_f1,
-    node_span_f1,
-    nted,
+    score_pair,
     span_audit_metrics,
-    tree_em,
 )
 from .schema import validate_stage2_schema
 from .ultimate_metrics import (
@@ -41,16 +42,23 @@ from .ultimate_metrics import (
 
 logger = get_logger("normbench.article2unit2structure.evaluation")
 
+# Below this many samples, worker start-up and pickling cost more than parallel scoring saves.
+_MIN_PARALLEL_SAMPLES = 32
+# Upper bound on the CLI default worker count; pass `--workers` explicitly to go beyond it.
+_MAX_DEFAULT_WORKERS = 32
+
+# (prediction record, matched_by) for one gold sample.
+_Match = Tuple[Optional[Dict[str, Any]], Optional[str]]
+# (per-sample record, (node_tp, node_pred, node_gold)).
+_Scored = Tuple[Dict[str, Any], Tuple[int, int, int]]
 
-def _empty_graph() -> Graph:
-    return Graph(nodes=set(), edges=set())
 
+# Invalid predictions all score against the same empty graph; frozensets keep it immutable.
+_EMPTY_GRAPH = Graph(nodes=frozenset(), edges=frozenset(), span_nodes=frozenset())
 
-def _write_jsonl(path: Path, records: List[Dict[str, Any]]) -> None:
-    payload = "\n".join(json.dumps(r, ensure_ascii=False) for r in records)
-    if payload:
-        payload += "\n"
-    path.write_text(payload, encoding="utf-8")
+
+def _empty_graph() -> Graph:
+    return _EMPTY_GRAPH
 
 
 def _load_structured_units(path: Path) -> List[Dict[str, Any]]:
@@ -96,6 +104,8 @@ def _load_rule_ids_from_manifest(path: Path) -> List[str]:
     return rule_ids
 
 
+# Prediction keys and gold sample keys are the same strings: normalize each once.
+@lru_cache(maxsize=65536)
 def _normalize_rule_id(rule_id: str) -> str:
     return rule_id.rstrip("|").strip()
 
@@ -119,6 +129,7 @@ def _fallback_unit_key(rule_id: Optional[str], unit_id: Optional[str]) -> Option
     return f"{rule_id}#{unit_id}"
 
 
+@lru_cache(maxsize=65536)
 def _normalize_unit_key(unit_key: str) -> str:
     key = unit_key.strip()
     if "#" not in key:
@@ -132,7 +143,9 @@ def _pred_key(record: Dict[str, Any]) -> Optional[str]:
     unit_key = record.get("unit_key")
     if isinstance(unit_key, str) and unit_key.strip():
         return _normalize_unit_key(unit_key)
-    structured = record.get("structured") if isinstance(record.get("structured"), dict) else {}
+    structured = record.get("structured")
+    if not isinstance(structured, dict):
+        structured = {}
     rule_id = structured.get("rule_id") or record.get("rule_id")
     unit_id = structured.get("unit_id") or record.get("unit_id")
     fallback = _fallback_unit_key(str(rule_id) if rule_id else None, str(unit_id) if unit_id else None)
@@ -150,6 +163,170 @@ def _index_predictions(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any
     return mapping
 
 
+def _match_prediction(sample: Stage2Sample, pred_index: Dict[str, Dict[str, Any]]) -> _Match:
+    pred_record = pred_index.get(_normalize_unit_key(sample.unit_key))
+    if pred_record is not None:
+        return pred_record, "unit_key"
+    fallback_key = _fallback_unit_key(sample.rule_id, sample.unit_id)
+    # The loader builds unit_key as rule_id#unit_id, so the fallback usually repeats the lookup above.
+    if fallback_key and fallback_key != sample.unit_key:
+        pred_record = pred_index.get(_normalize_unit_key(fallback_key))
+        if pred_record is not None:
+            return pred_record, "rule_id+unit_id"
+    return None, None
+
+
+def _score_sample(
+    sample: Stage2Sample,
+    match: _Match,
+    *,
+    strict_schema: bool,
+    iou_threshold: float,
+) -> _Scored:
+    """Score one gold sample against its matched prediction.
+
+    Pure and module-level so it can run in worker processes; the caller aggregates.
+    """
+
+    pred_record, match_key = match
+    gold_graph = build_graph(sample.gold_obj)
+
+    pred_obj = None
+    parse_error = None
+    if pred_record is not None:
+        pred_obj = pred_record.get("structured")
+        if not isinstance(pred_obj, dict):
+            parse_error = "structured_not_object"
+            pred_obj = None
+
+    parse_ok = pred_obj is not None
+
+    schema_ok = False
+    schema_errors: List[str] = []
+    if pred_obj is not None:
+        schema_ok, schema_errors = validate_stage2_schema(
+            pred_obj,
+            expected_fields=None,
+            strict=bool(strict_schema),
+        )
+
+    node_counts = (0, 0, 0)
+    invalid = (pred_obj is None) or (not schema_ok)
+    if invalid:
+        pred_graph = _empty_graph()
+        ef1 = 0.0
+        ep = 0.0
+        er = 0.0
+        em = 0.0
+        tp = 0
+        nf1 = 0.0
+        nt = 1.0
+        span_faith = 0.0
+        halluc = 1.0
+        tes = 0.0
+        soft_f1 = 0.0
+        defeater_recall = 0.0
+        gold_defeater_cnt = 0
+        pred_defeater_cnt = 0
+    else:
+        pred_graph = build_graph(pred_obj)
+        scores = score_pair(gold_graph, pred_graph)
+        e = scores.edge
+        ef1 = e.f1
+        ep = e.precision
+        er = e.recall
+        tp = e.tp
+        em = scores.tree_em
+        n = scores.node
+        nf1 = n.f1
+        node_counts = (n.tp, n.pred, n.gold)
+        nt = scores.nted
+        input_text = "\n".join(
+            [
+                str(sample.gold_obj.get("rule_text") or ""),
+                str(sample.gold_obj.get("unit_text") or ""),
+            ]
+        )
+        span_faith, halluc = span_audit_metrics(pred_obj, input_text=input_text)
+
+        gold_flat = structured_to_flat_tree(sample.gold_obj, input_text=input_text)
+        pred_flat = structured_to_flat_tree(pred_obj, input_text=input_text)
+        tes = compute_tree_edit_sim(pred_flat.tree, gold_flat.tree, ignore_spans=False)
+        soft_f1 = compute_soft_span_f1(
+            pred_flat.span_nodes,
+            gold_flat.span_nodes,
+            iou_threshold=float(iou_threshold),
+        )
+        defeater_recall = compute_defeater_recall(
+            pred_flat.span_nodes,
+            gold_flat.span_nodes,
+            iou_threshold=float(iou_threshold),
+        )
+        gold_defeater_cnt = len(gold_flat.defeater_nodes)
+        pred_defeater_cnt = len(pred_flat.defeater_nodes)
+
+    rec = {
+        "sample_id": sample.sample_id,
+        "unit_key": sample.unit_key,
+        "matched": pred_record is not None,
+        "matched_by": match_key,
+        "parse_ok": parse_ok,
+        "parse_error": parse_error,
+        "schema_ok": schema_ok,
+        "schema_errors": schema_errors,
+        "edge_f1": ef1,
+        "edge_precision": ep,
+        "edge_recall": er,
+        "tree_em": em,
+        "node_span_f1": nf1,
+        "nted": nt,
+        "span_faith": span_faith,
+        "halluc": halluc,
+        "tes": tes,
+        "soft_f1": soft_f1,
+        "defeater_recall": defeater_recall,
+        "gold_defeater_cnt": gold_defeater_cnt,
+        "pred_defeater_cnt": pred_defeater_cnt,
+        "gold_edges": len(gold_graph.edges),
+        "pred_edges": len(pred_graph.edges),
+        "tp": tp,
+    }
+    return rec, node_counts
+
+
+def default_workers() -> int:
+    """CPUs this process may run on (respects CPU affinity where supported), capped."""
+
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        n = os.cpu_count() or 1
+    return max(1, min(n, _MAX_DEFAULT_WORKERS))
+
+
+def _score_samples(
+    score: Callable[[Stage2Sample, _Match], _Scored],
+    samples: Sequence[Stage2Sample],
+    matches: Sequence[_Match],
+    *,
+    workers: int,
+) -> Iterator[_Scored]:
+    """Yield scored samples in input order."""
+
+    n_workers = int(workers)
+    if n_workers <= 1 or len(samples) < _MIN_PARALLEL_SAMPLES:
+        yield from map(score, samples, matches)
+        return
+    # Samples are independent and CPU-bound (tree edit distance dominates): fan out across processes.
+    chunksize = max(1, len(samples) // (n_workers * 4))
+    # Not fork: the logging QueueListener thread is already running, and forking a threaded
+    # process can deadlock the children. Workers re-import the caller's __main__, which is why
+    # only the CLIs default to parallel scoring.
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context(start_method)) as pool:
+        yield from pool.map(score, samples, matches, chunksize=chunksize)
+
+
 def _write_readme(
     path: Path,
     *,
@@ -159,9 +336,12 @@ def _write_readme(
     metrics: Dict[str, Any],
     missing_samples: List[Dict[str, Any]],
 ) -> None:
-    counts = (metrics.get("counts") or {}) if isinstance(metrics.get("counts"), dict) else {}
-    rates = (metrics.get("rates") or {}) if isinstance(metrics.get("rates"), dict) else {}
-    t1 = (metrics.get("t1") or {}) if isinstance(metrics.get("t1"), dict) else {}
+    counts = metrics.get("counts")
+    counts = counts if isinstance(counts, dict) else {}
+    rates = metrics.get("rates")
+    rates = rates if isinstance(rates, dict) else {}
+    t1 = metrics.get("t1")
+    t1 = t1 if isinstance(t1, dict) else {}
 
     lines: List[str] = []
     lines.append("# Run Summary (Gold-based)")
@@ -247,6 +427,7 @@ def run_evaluation(
     fixed_structured_path: Optional[Path] = None,
     eval_subdir: str = "evaluation",
     subset_mode: str = "auto",
+    workers: int = 1,
 ) -> Path:
     structured_path = _resolve_structured_path(run_root, stage=stage, structured_path=structured_path)
 
@@ -264,7 +445,8 @@ def run_evaluation(
         if not isinstance(meta, dict):
             meta = {}
 
-    gen_settings = (meta.get("generation") or {}) if isinstance(meta.get("generation"), dict) else {}
+    gen_settings = meta.get("generation")
+    gen_settings = gen_settings if isinstance(gen_settings, dict) else {}
     effective_limit = limit
     if effective_limit is None:
         # Only infer unit-level limits here. Article-level caps (e.g. one-call runs)
@@ -289,24 +471,15 @@ def run_evaluation(
         structured_path = fix_structured_units(structured_path, units_path, fixed_structured_path)
 
     # Load dataset and optionally filter to this run's subset.
+    # The loader applies the fraction before the limit, so the limit is handled there too.
     dataset = load_stage2_dataset(
         dataset_path,
-        limit=None,
+        limit=effective_limit,
         usable_only=not include_nonusable,
         sample_frac=effective_sample_frac,
         sample_seed=effective_sample_seed,
     )
-    if effective_limit is not None:
-        dataset = type(dataset)(
-            dataset_path=dataset.dataset_path,
-            dataset_format_version=dataset.dataset_format_version,
-            generated_at=dataset.generated_at,
-            batch_id=dataset.batch_id,
-            source_run_dir=dataset.source_run_dir,
-            prompt_template=dataset.prompt_template,
-            samples=dataset.samples[: int(effective_limit)],
-        )
-
+    samples = dataset.samples
     if subset_mode != "none":
         rule_ids: List[str] = []
         if subset_mode in {"auto", "units"}:
@@ -317,21 +490,19 @@ def run_evaluation(
                 rule_ids = _load_rule_ids_from_manifest(manifest)
         want = set(rule_ids)
         if want:
-            dataset = type(dataset)(
-                dataset_path=dataset.dataset_path,
-                dataset_format_version=dataset.dataset_format_version,
-                generated_at=dataset.generated_at,
-                batch_id=dataset.batch_id,
-                source_run_dir=dataset.source_run_dir,
-                prompt_template=dataset.prompt_template,
-                samples=[s for s in dataset.samples if _normalize_rule_id(s.rule_id) in want],
-            )
+            # Units of one article share a rule_id: normalize each distinct id once.
+            keep = {rid for rid in {s.rule_id for s in samples} if _normalize_rule_id(rid) in want}
+            samples = [s for s in samples if s.rule_id in keep]
+
+    if samples is not dataset.samples:
+        dataset = replace(dataset, samples=samples)
 
     # Predictions
     pred_records = _load_structured_units(structured_path)
     pred_index = _index_predictions(pred_records)
 
-    per_sample: List[Dict[str, Any]] = []
+    # Only unmatched samples are kept in memory (for README); rows stream to per_sample.jsonl.
+    missing_samples: List[Dict[str, Any]] = []
 
     total = 0
     done = 0
@@ -361,152 +532,48 @@ def run_evaluation(
     defeater_recall_goldpos_sum = 0.0
     defeater_goldpos_cnt = 0
 
-    for sample in dataset.samples:
-        total += 1
-        gold_graph = build_graph(sample.gold_obj)
-        pred_record = pred_index.get(_normalize_unit_key(sample.unit_key))
-        match_key = "unit_key"
-        if pred_record is None:
-            fallback_key = _fallback_unit_key(sample.rule_id, sample.unit_id)
-            if fallback_key:
-                pred_record = pred_index.get(_normalize_unit_key(fallback_key))
-                match_key = "rule_id+unit_id"
+    matches = [_match_prediction(sample, pred_index) for sample in dataset.samples]
+    score = partial(_score_sample, strict_schema=bool(strict_schema), iou_threshold=float(iou_threshold))
+    scored = _score_samples(score, dataset.samples, matches, workers=workers)
+
+    # Aggregate in dataset order so sums match the sequential path exactly.
+    with (eval_dir / "per_sample.jsonl").open("wb") as per_sample_f:
+        for rec, (n_tp, n_pred, n_gold) in scored:
+            total += 1
+            if rec["matched"]:
+                done += 1
+            else:
+                missing_samples.append({"sample_id": rec["sample_id"], "unit_key": rec["unit_key"]})
+            if rec["parse_ok"]:
+                parse_ok_cnt += 1
+            if rec["schema_ok"]:
+                schema_ok_cnt += 1
+
+            node_tp += n_tp
+            node_pred += n_pred
+            node_gold += n_gold
+            if rec["gold_defeater_cnt"] > 0:
+                defeater_recall_goldpos_sum += rec["defeater_recall"]
+                defeater_goldpos_cnt += 1
 
-        if pred_record is not None:
-            done += 1
+            tree_em_sum += rec["tree_em"]
+            f1_sum += rec["edge_f1"]
+            prec_sum += rec["edge_precision"]
+            recall_sum += rec["edge_recall"]
+            node_f1_sum += rec["node_span_f1"]
+            nted_sum += rec["nted"]
+            span_faith_sum += rec["span_faith"]
+            halluc_sum += rec["halluc"]
 
-        pred_obj = None
-        parse_error = None
-        if pred_record is not None:
-            pred_obj = pred_record.get("structured")
-            if not isinstance(pred_obj, dict):
-                parse_error = "structured_not_object"
-                pred_obj = None
-
-        parse_ok = pred_obj is not None
-        if parse_ok:
-            parse_ok_cnt += 1
-
-        schema_ok = False
-        schema_errors: List[str] = []
-        if pred_obj is not None:
-            schema_ok, schema_errors = validate_stage2_schema(
-                pred_obj,
-                expected_fields=None,
-                strict=bool(strict_schema),
-            )
-        if schema_ok:
-            schema_ok_cnt += 1
-
-        invalid = (pred_obj is None) or (not schema_ok)
-        if invalid:
-            pred_graph = _empty_graph()
-            ef1 = 0.0
-            ep = 0.0
-            er = 0.0
-            em = 0.0
-            tp = 0
-            pe = 0
-            ge = len(gold_graph.edges)
-            nf1 = 0.0
-            nt = 1.0
-            span_faith = 0.0
-            halluc = 1.0
-            tes = 0.0
-            soft_f1 = 0.0
-            defeater_recall = 0.0
-            gold_defeater_cnt = 0
-            pred_defeater_cnt = 0
-        else:
-            pred_graph = build_graph(pred_obj)
-            e = edge_f1(gold_graph.edges, pred_graph.edges)
-            ef1 = e.f1
-            ep = e.precision
-            er = e.recall
-            tp = e.tp
-            pe = e.pred_edges
-            ge = e.gold_edges
-            em = tree_em(gold_graph, pred_graph)
-            n = node_span_f1(gold_graph.nodes, pred_graph.nodes)
-            nf1 = n.f1
-            node_tp += n.tp
-            node_pred += n.pred
-            node_gold += n.gold
-            nt = nted(gold_graph, pred_graph)
-            input_text = "\n".join(
-                [
-                    str(sample.gold_obj.get("rule_text") or ""),
-                    str(sample.gold_obj.get("unit_text") or ""),
-                ]
-            )
-            span_faith, halluc = span_audit_metrics(pred_obj, input_text=input_text)
-
-            gold_flat = structured_to_flat_tree(sample.gold_obj, input_text=input_text)
-            pred_flat = structured_to_flat_tree(pred_obj, input_text=input_text)
-            tes = compute_tree_edit_sim(pred_flat.tree, gold_flat.tree, ignore_spans=False)
-            soft_f1 = compute_soft_span_f1(
-                pred_flat.span_nodes,
-                gold_flat.span_nodes,
-                iou_threshold=float(iou_threshold),
-            )
-            defeater_recall = compute_defeater_recall(
-                pred_flat.span_nodes,
-                gold_flat.span_nodes,
-                iou_threshold=float(iou_threshold),
-            )
-            gold_defeater_cnt = len(gold_flat.defeater_nodes)
-            pred_defeater_cnt = len(pred_flat.defeater_nodes)
-            if gold_defeater_cnt > 0:
-                defeater_recall_goldpos_sum += defeater_recall
-                defeater_goldpos_cnt += 1
+            tes_sum += rec["tes"]
+            soft_f1_sum += rec["soft_f1"]
+            defeater_recall_sum += rec["defeater_recall"]
 
-        tree_em_sum += em
-        f1_sum += ef1
-        prec_sum += ep
-        recall_sum += er
-        node_f1_sum += nf1
-        nted_sum += nt
-        span_faith_sum += span_faith
-        halluc_sum += halluc
-
-        tes_sum += tes
-        soft_f1_sum += soft_f1
-        defeater_recall_sum += defeater_recall
-
-        micro_tp += tp
-        micro_pred_edges += pe
-        micro_gold_edges += ge
-
-        per_sample.append(
-            {
-                "sample_id": sample.sample_id,
-                "unit_key": sample.unit_key,
-                "matched": pred_record is not None,
-                "matched_by": match_key if pred_record is not None else None,
-                "parse_ok": parse_ok,
-                "parse_error": parse_error,
-                "schema_ok": schema_ok,
-                "schema_errors": schema_errors,
-                "edge_f1": ef1,
-                "edge_precision": ep,
-                "edge_recall": er,
-                "tree_em": em,
-                "node_span_f1": nf1,
-                "nted": nt,
-                "span_faith": span_faith,
-                "halluc": halluc,
-                "tes": tes,
-                "soft_f1": soft_f1,
-                "defeater_recall": defeater_recall,
-                "gold_defeater_cnt": gold_defeater_cnt,
-                "pred_defeater_cnt": pred_defeater_cnt,
-                "gold_edges": len(gold_graph.edges),
-                "pred_edges": len(pred_graph.edges),
-                "tp": tp,
-            }
-        )
+            micro_tp += rec["tp"]
+            micro_pred_edges += rec["pred_edges"]
+            micro_gold_edges += rec["gold_edges"]
 
-    missing_samples = [r for r in per_sample if not r.get("matched")]
+            per_sample_f.write(jsonl_line(rec))
 
     # Edge micro.
     if micro_pred_edges == 0:
@@ -599,7 +666,6 @@ def run_evaluation(
 
     write_json(eval_dir / "metrics_full.json", metrics)
     write_json(eval_dir / "metrics.json", metrics.get("t1") or {})
-    _write_jsonl(eval_dir / "per_sample.jsonl", per_sample)
     _write_readme(
         eval_dir / "README.md",
         run_root=run_root,
@@ -646,6 +712,7 @@ def main() -> None:
         default="auto",
         help="filter gold to run subset (auto: prefer units.json, then manifest)",
     )
+    parser.add_argument("--workers", type=int, default=None, help="scoring processes (default: available CPUs, at most 32; 1 = sequential)")
     args = parser.parse_args()
 
     if not args.run_dir.exists():
@@ -667,6 +734,7 @@ def main() -> None:
         fixed_structured_path=args.fixed_structured_path,
         eval_subdir=str(args.eval_subdir),
         subset_mode=str(args.subset_mode),
+        workers=args.workers if args.workers is not None else default_workers(),
     )
 
 
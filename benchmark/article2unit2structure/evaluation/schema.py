@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 FINAL_PATTERN = re.compile(r"<final>([\s\S]*?)</final>", re.IGNORECASE)
 
-ST2_TOP_KEYS = {
+ST2_TOP_KEYS = frozenset({
     "schema_version",
     "rule_id",
     "law_title",
@@ -20,9 +19,9 @@ ST2_TOP_KEYS = {
     "unit_reason",
     "branches",
     "meta",
-}
+})
 
-ST2_BRANCH_KEYS = {
+ST2_BRANCH_KEYS = frozenset({
     "branch_id",
     "anchor",
     "norm_kind",
@@ -32,14 +31,35 @@ ST2_BRANCH_KEYS = {
     "depends_on_article_ref",
     "unresolved_reference",
     "notes",
-}
+})
+
+# Top-level fields that must be strings when present.
+ST2_TOP_STR_KEYS = (
+    "schema_version",
+    "rule_id",
+    "law_title",
+    "article_number",
+    "rule_text",
+    "unit_id",
+    "unit_text",
+    "unit_reason",
+)
+
+_EFFECT_KEYS = frozenset({"effect_id", "effect_text"})
+_LEAF_KEYS = frozenset({"leaf_id", "tag", "text"})
+_META_KEYS = frozenset({"scope_policy", "compressed_enum", "unresolved_reference", "notes"})
+_BRANCH_STR_LIST_KEYS = ("depends_on_units", "depends_on_article_ref")
+_CONDITION_OPS = frozenset({"AND", "OR"})
 
 
 def extract_final_block(text: str) -> Optional[str]:
-    matches = FINAL_PATTERN.findall(text or "")
-    if not matches:
+    # Only the last block is used: walk the matches without collecting every capture.
+    last = None
+    for last in FINAL_PATTERN.finditer(text or ""):
+        pass
+    if last is None:
         return None
-    return matches[-1].strip()
+    return last.group(1).strip()
 
 
 def _strip_code_fences(text: str) -> str:
@@ -74,6 +94,10 @@ class ParsedOutput:
 def parse_stage2_output(raw_content: str) -> ParsedOutput:
     """Extract `<final>` and parse JSON inside it."""
 
+    # Deferred: importing the JSON backend (orjson) is most of this module's import time, and
+    # callers that only validate already-parsed objects never need it.
+    from ...common.io import loads
+
     final_text = extract_final_block(raw_content)
     if final_text is None:
         return ParsedOutput(
@@ -85,7 +109,7 @@ def parse_stage2_output(raw_content: str) -> ParsedOutput:
 
     candidate = _strip_code_fences(final_text)
     try:
-        obj = json.loads(candidate)
+        obj = loads(candidate)
     except Exception as e:  # noqa: BLE001
         return ParsedOutput(
             raw_content=raw_content,
@@ -101,17 +125,13 @@ def parse_stage2_output(raw_content: str) -> ParsedOutput:
     )
 
 
-def _is_str(x: Any) -> bool:
-    return isinstance(x, str)
-
-
-def _require_keys(obj: Dict[str, Any], required: set[str], *, strict: bool) -> List[str]:
+def _require_keys(obj: Dict[str, Any], required: FrozenSet[str], *, strict: bool) -> List[str]:
     errors: List[str] = []
-    missing = required - set(obj.keys())
+    missing = [k for k in required if k not in obj]
     if missing:
         errors.append(f"missing_keys: {sorted(missing)}")
     if strict:
-        extra = set(obj.keys()) - required
+        extra = [k for k in obj if k not in required]
         if extra:
             errors.append(f"extra_keys: {sorted(extra)}")
     return errors
@@ -138,20 +158,11 @@ def validate_stage2_schema(
     errors.extend(_require_keys(obj, ST2_TOP_KEYS, strict=strict))
 
     # Basic types
-    for k in [
-        "schema_version",
-        "rule_id",
-        "law_title",
-        "article_number",
-        "rule_text",
-        "unit_id",
-        "unit_text",
-        "unit_reason",
-    ]:
-        if k in obj and not _is_str(obj[k]):
+    for k in ST2_TOP_STR_KEYS:
+        if k in obj and not isinstance(obj[k], str):
             errors.append(f"type_error:{k}:expected_str")
 
-    if "schema_version" in obj and _is_str(obj["schema_version"]) and obj["schema_version"] != "st2.v3":
+    if "schema_version" in obj and isinstance(obj["schema_version"], str) and obj["schema_version"] != "st2.v3":
         errors.append("schema_version_not_st2.v3")
 
     # branches
@@ -170,12 +181,12 @@ def validate_stage2_schema(
         if not isinstance(anchor, dict):
             errors.append(f"branch[{i}].anchor_not_object")
         else:
-            if "text" in anchor and not _is_str(anchor["text"]):
+            if "text" in anchor and not isinstance(anchor["text"], str):
                 errors.append(f"branch[{i}].anchor.text_not_str")
             if "occurrence" in anchor and not isinstance(anchor["occurrence"], int):
                 errors.append(f"branch[{i}].anchor.occurrence_not_int")
 
-        if "norm_kind" in b and not _is_str(b["norm_kind"]):
+        if "norm_kind" in b and not isinstance(b["norm_kind"], str):
             errors.append(f"branch[{i}].norm_kind_not_str")
 
         # conditions (tree)
@@ -194,23 +205,23 @@ def validate_stage2_schema(
                     errors.append(f"branch[{i}].effects[{j}]_not_object")
                     continue
                 if strict:
-                    extra = set(eff.keys()) - {"effect_id", "effect_text"}
+                    extra = [k for k in eff if k not in _EFFECT_KEYS]
                     if extra:
                         errors.append(f"branch[{i}].effects[{j}].extra_keys:{sorted(extra)}")
-                if not _is_str(eff.get("effect_id")):
+                if not isinstance(eff.get("effect_id"), str):
                     errors.append(f"branch[{i}].effects[{j}].effect_id_not_str")
-                if not _is_str(eff.get("effect_text")):
+                if not isinstance(eff.get("effect_text"), str):
                     errors.append(f"branch[{i}].effects[{j}].effect_text_not_str")
 
         # depends
-        for list_key in ["depends_on_units", "depends_on_article_ref"]:
+        for list_key in _BRANCH_STR_LIST_KEYS:
             v = b.get(list_key)
-            if not isinstance(v, list) or any(not _is_str(x) for x in v):
+            if not isinstance(v, list) or any(not isinstance(x, str) for x in v):
                 errors.append(f"branch[{i}].{list_key}_not_list_of_str")
 
         if "unresolved_reference" in b and not isinstance(b["unresolved_reference"], bool):
             errors.append(f"branch[{i}].unresolved_reference_not_bool")
-        if "notes" in b and not _is_str(b["notes"]):
+        if "notes" in b and not isinstance(b["notes"], str):
             errors.append(f"branch[{i}].notes_not_str")
 
     # meta (minimal)
@@ -219,16 +230,16 @@ def validate_stage2_schema(
         errors.append("meta_not_object")
     else:
         if strict:
-            extra = set(meta.keys()) - {"scope_policy", "compressed_enum", "unresolved_reference", "notes"}
+            extra = [k for k in meta if k not in _META_KEYS]
             if extra:
                 errors.append(f"meta.extra_keys:{sorted(extra)}")
-        if "scope_policy" in meta and not _is_str(meta["scope_policy"]):
+        if "scope_policy" in meta and not isinstance(meta["scope_policy"], str):
             errors.append("meta.scope_policy_not_str")
         if "compressed_enum" in meta and not isinstance(meta["compressed_enum"], bool):
             errors.append("meta.compressed_enum_not_bool")
         if "unresolved_reference" in meta and not isinstance(meta["unresolved_reference"], bool):
             errors.append("meta.unresolved_reference_not_bool")
-        if "notes" in meta and not _is_str(meta["notes"]):
+        if "notes" in meta and not isinstance(meta["notes"], str):
             errors.append("meta.notes_not_str")
 
     # Enforce alignment with expected fields (hard constraints)
@@ -238,7 +249,7 @@ def validate_stage2_schema(
             if got is None:
                 errors.append(f"expected_field_missing:{k}")
                 continue
-            if not _is_str(got):
+            if not isinstance(got, str):
                 errors.append(f"expected_field_type_error:{k}")
                 continue
             if got != expected:
@@ -254,7 +265,7 @@ def _validate_condition_tree(node: Any, *, strict: bool) -> Tuple[bool, List[str
         return False, ["not_object"]
     if "op" not in node or "items" not in node:
         return False, ["missing_op_or_items"]
-    if not _is_str(node.get("op")) or node["op"] not in {"AND", "OR"}:
+    if not isinstance(node.get("op"), str) or node["op"] not in _CONDITION_OPS:
         return False, ["op_invalid"]
     items = node.get("items")
     if not isinstance(items, list):
@@ -273,14 +284,14 @@ def _validate_condition_tree(node: Any, *, strict: bool) -> Tuple[bool, List[str
 
         # leaf
         if strict:
-            extra = set(it.keys()) - {"leaf_id", "tag", "text"}
+            extra = [k for k in it if k not in _LEAF_KEYS]
             if extra:
                 errors.append(f"item[{idx}].extra_keys:{sorted(extra)}")
-        if not _is_str(it.get("leaf_id")):
+        if not isinstance(it.get("leaf_id"), str):
             errors.append(f"item[{idx}].leaf_id_not_str")
-        if not _is_str(it.get("tag")):
+        if not isinstance(it.get("tag"), str):
             errors.append(f"item[{idx}].tag_not_str")
-        if not _is_str(it.get("text")):
+        if not isinstance(it.get("text"), str):
             errors.append(f"item[{idx}].text_not_str")
 
     return len(errors) == 0, errors
@@ -1,26 +1,43 @@
 """Ultimate metrics (TES / SoftF1 / DefeaterRecall) for st2.v3 outputs.
 
-This module is a self-contained (no SciPy) implementation of:
+This module is self-contained (SciPy optional) and implements:
 - TES (Tree-Edit Similarity): 1 - (tree-edit-distance / (|V_pred| + |V_gold|))
 - SoftF1: max-weight matching by IoU, TP if IoU >= threshold
 - DefeaterRecall: recall over defeater-like nodes (leaf tag "排除")
 
 st2.v3 structured outputs do not provide byte offsets; we approximate spans by
 substring search over whitespace-normalized `input_text = gold.rule_text + "\\n" + gold.unit_text`.
+
+Assignments use a pure-Python Hungarian. Setting `NORMBENCH_SCIPY_ASSIGNMENT=1` switches to
+`scipy.optimize.linear_sum_assignment` (and numpy IoU matrices); SciPy breaks cost ties
+differently, so SoftF1/TES can differ from the default and are only comparable within one mode.
 """
 
 from __future__ import annotations
 
 import math
-import re
+import os
+import sys
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+np = None  # type: ignore[assignment]
+_scipy_lsa = None
+# Opt-in only: scores must not depend on whether SciPy happens to be installed.
+if os.environ.get("NORMBENCH_SCIPY_ASSIGNMENT") == "1":
+    try:  # optional dependency: C assignment solver
+        import numpy as np  # type: ignore
+        from scipy.optimize import linear_sum_assignment as _scipy_lsa  # type: ignore
+    except ImportError:  # pragma: no cover - pure-Python Hungarian below
+        np = None  # type: ignore[assignment]
+        _scipy_lsa = None
+
 Span = Optional[Tuple[int, int]]
 
 
 def _norm_ws(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    # Same as stripping and collapsing `\s+` runs: str.split() uses the same whitespace set as `\s`.
+    return " ".join((s or "").split())
 
 
 def _find_nth(haystack: str, needle: str, n: int) -> int:
@@ -34,15 +51,15 @@ def _find_nth(haystack: str, needle: str, n: int) -> int:
     return pos
 
 
-def find_span_in_text(*, text: str, input_text: str, occurrence: Optional[int] = None) -> Span:
-    """Return (start,end) on a whitespace-normalized `input_text`, or None if not found."""
+def _occurrence_index(occurrence: Any) -> int:
+    return int(occurrence) if isinstance(occurrence, int) and occurrence >= 1 else 1
+
+
+def _locate_span(hay: str, needle: str, occ: int) -> Span:
+    """Span of the `occ`-th `needle` in `hay` (both already whitespace-normalized)."""
 
-    needle = _norm_ws(text)
-    hay = _norm_ws(input_text)
     if not needle:
         return None
-
-    occ = int(occurrence) if isinstance(occurrence, int) and occurrence >= 1 else 1
     start = _find_nth(hay, needle, occ)
     if start < 0:
         # Fallback: try the first occurrence even if occ is off.
@@ -52,6 +69,12 @@ def find_span_in_text(*, text: str, input_text: str, occurrence: Optional[int] =
     return (start, start + len(needle))
 
 
+def find_span_in_text(*, text: str, input_text: str, occurrence: Optional[int] = None) -> Span:
+    """Return (start,end) on a whitespace-normalized `input_text`, or None if not found."""
+
+    return _locate_span(_norm_ws(input_text), _norm_ws(text), _occurrence_index(occurrence))
+
+
 def _structural_span() -> Tuple[int, int]:
     # Non-span nodes should not be penalized by IoU-based rename cost.
     return (0, 1)
@@ -73,7 +96,7 @@ def _calculate_iou(span1: Span, span2: Span) -> float:
 
 
 def _linear_sum_assignment_min(cost: Sequence[Sequence[float]]) -> Tuple[List[int], List[int]]:
-    """Min-cost assignment for a rectangular cost matrix (pure Python Hungarian).
+    """Min-cost assignment for a rectangular cost matrix (pure Python Hungarian unless SciPy is opted in).
 
     Behavior matches scipy.optimize.linear_sum_assignment:
     - If n_rows <= n_cols: every row is assigned to one column -> len(row_ind)=n_rows
@@ -90,13 +113,19 @@ def _linear_sum_assignment_min(cost: Sequence[Sequence[float]]) -> Tuple[List[in
         if len(row) != m:
             raise ValueError("cost matrix must be rectangular")
 
+    if _scipy_lsa is not None:
+        row_ind, col_ind = _scipy_lsa(np.asarray(cost, dtype=np.float64))
+        return row_ind.tolist(), col_ind.tolist()
+
     # Hungarian implementation below assumes m >= n (more columns than rows).
+    # Rows are copied to 1-indexed float lists once so the inner loop is a plain index.
     transposed = False
     if n > m:
         transposed = True
-        cost_t = [[float(cost[i][j]) for i in range(n)] for j in range(m)]
-        cost = cost_t
+        rows = [[0.0] + [float(cost[i][j]) for i in range(n)] for j in range(m)]
         n, m = m, n
+    else:
+        rows = [[0.0] + [float(c) for c in row] for row in cost]
 
     # 1-indexed arrays.
     u = [0.0] * (n + 1)
@@ -112,17 +141,20 @@ def _linear_sum_assignment_min(cost: Sequence[Sequence[float]]) -> Tuple[List[in
         while True:
             used[j0] = True
             i0 = p[j0]
+            row = rows[i0 - 1]
+            u_i0 = u[i0]
             delta = math.inf
             j1 = 0
             for j in range(1, m + 1):
                 if used[j]:
                     continue
-                cur = float(cost[i0 - 1][j - 1]) - u[i0] - v[j]
-                if cur < minv[j]:
-                    minv[j] = cur
+                cur = row[j] - u_i0 - v[j]
+                mj = minv[j]
+                if cur < mj:
+                    minv[j] = mj = cur
                     way[j] = j0
-                if minv[j] < delta:
-                    delta = minv[j]
+                if mj < delta:
+                    delta = mj
                     j1 = j
             for j in range(m + 1):
                 if used[j]:
@@ -175,6 +207,9 @@ def _linear_sum_assignment_max(weight: Sequence[Sequence[float]]) -> Tuple[List[
     m = len(weight[0]) if weight[0] is not None else 0
     if m == 0:
         return [], []
+    if _scipy_lsa is not None:
+        row_ind, col_ind = _scipy_lsa(np.asarray(weight, dtype=np.float64), maximize=True)
+        return row_ind.tolist(), col_ind.tolist()
     max_w = max(float(weight[i][j]) for i in range(n) for j in range(m))
     cost = [[max_w - float(weight[i][j]) for j in range(m)] for i in range(n)]
     return _linear_sum_assignment_min(cost)
@@ -215,13 +250,37 @@ def _build_tree(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 def _count_nodes(tree: Optional[Dict[str, Any]]) -> int:
     if tree is None:
         return 0
-    c = 1
-    for child in tree.get("children", []) or []:
-        if isinstance(child, dict):
-            c += _count_nodes(child)
+    c = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        c += 1
+        stack.extend(child for child in node.get("children", []) or [] if isinstance(child, dict))
     return c
 
 
+def _levels(tree: Dict[str, Any]) -> List[List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]]:
+    """Nodes of `tree` grouped by depth, each paired with its dict children."""
+
+    levels: List[List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]] = []
+    seen: set[int] = set()
+    frontier = [tree]
+    while frontier:
+        level = []
+        next_frontier: List[Dict[str, Any]] = []
+        for node in frontier:
+            seen.add(id(node))
+            children = [c for c in (node.get("children", []) or []) if isinstance(c, dict)]
+            level.append((node, children))
+            next_frontier.extend(children)
+        levels.append(level)
+        # An acyclic tree cannot be deeper than its number of distinct nodes.
+        if len(levels) > len(seen):
+            raise ValueError("tree contains a cycle")
+        frontier = next_frontier
+    return levels
+
+
 def compute_tree_edit_sim(pred_data: Dict[str, Any], gold_data: Dict[str, Any], *, ignore_spans: bool = False) -> float:
     """TES: Tree-Edit Similarity in [0,1]."""
 
@@ -232,57 +291,136 @@ def compute_tree_edit_sim(pred_data: Dict[str, Any], gold_data: Dict[str, Any],
     if t1 is None or t2 is None:
         return 0.0
 
-    memo: Dict[Tuple[str, str], float] = {}
+    levels1 = _levels(t1)
+    levels2 = _levels(t2)
+
+    # Subtree sizes (insert/delete cost), deepest level first. Keyed by node identity: both
+    # trees stay alive for the whole computation.
+    sizes: Dict[int, int] = {}
+    for levels in (levels1, levels2):
+        for level in reversed(levels):
+            for node, children in level:
+                sizes[id(node)] = 1 + sum(sizes[id(c)] for c in children)
+
+    # TED only ever pairs nodes at the same depth, and every same-depth pair is reached from
+    # the roots, so fill the memo bottom-up level by level instead of recursing.
+    memo: Dict[Tuple[int, int], float] = {}
+    for depth in range(min(len(levels1), len(levels2)) - 1, -1, -1):
+        for n1, c1 in levels1[depth]:
+            for n2, c2 in levels2[depth]:
+                key = (id(n1), id(n2))
+                if key in memo:
+                    continue
 
-    def ted(n1: Dict[str, Any], n2: Dict[str, Any]) -> float:
-        k1 = str(n1.get("id") or "")
-        k2 = str(n2.get("id") or "")
-        key = (k1, k2)
-        if key in memo:
-            return memo[key]
+                if n1.get("type") != n2.get("type"):
+                    node_cost = 1.0
+                elif ignore_spans:
+                    node_cost = 0.0
+                else:
+                    node_cost = 1.0 - _calculate_iou(n1.get("span"), n2.get("span"))
 
-        if n1.get("type") != n2.get("type"):
-            node_cost = 1.0
-        else:
-            if ignore_spans:
-                node_cost = 0.0
-            else:
-                node_cost = 1.0 - _calculate_iou(n1.get("span"), n2.get("span"))
-
-        children1 = n1.get("children", []) or []
-        children2 = n2.get("children", []) or []
-        if not children1 and not children2:
-            memo[key] = float(node_cost)
-            return float(node_cost)
-
-        c1 = [c for c in children1 if isinstance(c, dict)]
-        c2 = [c for c in children2 if isinstance(c, dict)]
-
-        match_cost = 0.0
-        matched_rows: set[int] = set()
-        matched_cols: set[int] = set()
-        if c1 and c2:
-            c_matrix = [[ted(a, b) for b in c2] for a in c1]
-            row_ind, col_ind = _linear_sum_assignment_min(c_matrix)
-            for r, c in zip(row_ind, col_ind):
-                match_cost += float(c_matrix[r][c])
-                matched_rows.add(int(r))
-                matched_cols.add(int(c))
-
-        del_cost = sum(_count_nodes(c1[i]) for i in range(len(c1)) if i not in matched_rows)
-        ins_cost = sum(_count_nodes(c2[j]) for j in range(len(c2)) if j not in matched_cols)
-
-        total_cost = float(node_cost) + float(match_cost) + float(del_cost) + float(ins_cost)
-        memo[key] = total_cost
-        return total_cost
-
-    distance = ted(t1, t2)
-    max_dist = _count_nodes(t1) + _count_nodes(t2)
+                if not c1 and not c2:
+                    memo[key] = float(node_cost)
+                    continue
+
+                match_cost = 0.0
+                matched_rows: set[int] = set()
+                matched_cols: set[int] = set()
+                if c1 and c2:
+                    c_matrix = [[memo[(id(a), id(b))] for b in c2] for a in c1]
+                    row_ind, col_ind = _linear_sum_assignment_min(c_matrix)
+                    for r, c in zip(row_ind, col_ind):
+                        match_cost += float(c_matrix[r][c])
+                        matched_rows.add(int(r))
+                        matched_cols.add(int(c))
+
+                del_cost = sum(sizes[id(c1[i])] for i in range(len(c1)) if i not in matched_rows)
+                ins_cost = sum(sizes[id(c2[j])] for j in range(len(c2)) if j not in matched_cols)
+
+                memo[key] = float(node_cost) + float(match_cost) + float(del_cost) + float(ins_cost)
+
+    distance = memo[(id(t1), id(t2))]
+    max_dist = sizes[id(t1)] + sizes[id(t2)]
     if max_dist <= 0:
         return 1.0
     return max(0.0, 1.0 - (distance / max_dist))
 
 
+# Below this many pred x gold cells, building numpy arrays costs more than the Python loop.
+_NUMPY_IOU_MIN_CELLS = 256
+
+
+def _iou_weights(pnodes: Sequence[Dict[str, Any]], gnodes: Sequence[Dict[str, Any]]) -> Sequence[Sequence[float]]:
+    """IoU matrix (pred x gold); 0.0 where node types differ."""
+
+    if np is not None and len(pnodes) * len(gnodes) >= _NUMPY_IOU_MIN_CELLS:
+        return _iou_weights_numpy(pnodes, gnodes)
+
+    # Pull (type, span) out of each node once instead of twice per pair.
+    gold = [(g.get("type"), g.get("span")) for g in gnodes]
+    weights: List[List[float]] = []
+    for p in pnodes:
+        p_type = p.get("type")
+        p_span = p.get("span")
+        weights.append([_calculate_iou(p_span, g_span) if p_type == g_type else 0.0 for g_type, g_span in gold])
+    return weights
+
+
+def _iou_weights_numpy(pnodes: Sequence[Dict[str, Any]], gnodes: Sequence[Dict[str, Any]]) -> Any:
+    """Broadcast form of `_iou_weights` (same values as `_calculate_iou`), for large matrices."""
+
+    type_codes: Dict[Any, int] = {}
+
+    def columns(nodes: Sequence[Dict[str, Any]]) -> Tuple[Any, Any, Any, Any]:
+        codes = np.fromiter(
+            (type_codes.setdefault(n.get("type"), len(type_codes)) for n in nodes), dtype=np.int64, count=len(nodes)
+        )
+        spans = [n.get("span") for n in nodes]
+        has_span = np.fromiter((bool(sp) for sp in spans), dtype=bool, count=len(nodes))
+        bounds = np.array([sp if sp else (0, 0) for sp in spans], dtype=np.float64).reshape(len(nodes), 2)
+        return codes, has_span, bounds[:, 0], bounds[:, 1]
+
+    p_type, p_ok, p_start, p_end = columns(pnodes)
+    g_type, g_ok, g_start, g_end = columns(gnodes)
+    inter = np.minimum(p_end[:, None], g_end[None, :]) - np.maximum(p_start[:, None], g_start[None, :])
+    union = (p_end - p_start)[:, None] + (g_end - g_start)[None, :] - inter
+    valid = (inter > 0) & (union > 0) & p_ok[:, None] & g_ok[None, :] & (p_type[:, None] == g_type[None, :])
+    weights = np.zeros(inter.shape, dtype=np.float64)
+    np.divide(inter, union, out=weights, where=valid)
+    return weights
+
+
+def _count_iou_matches(pnodes: Sequence[Dict[str, Any]], gnodes: Sequence[Dict[str, Any]], *, iou_threshold: float) -> int:
+    """Pairs with IoU >= threshold in a max-weight pred/gold assignment.
+
+    Cross-type weights are 0, so with a positive threshold the matrix is block-diagonal by
+    node type and each block is solved on its own; pairs across blocks can never count.
+    """
+
+    threshold = float(iou_threshold)
+    if threshold <= 0.0:
+        blocks = [(pnodes, gnodes)]
+    else:
+        p_by_type: Dict[Any, List[Dict[str, Any]]] = {}
+        for n in pnodes:
+            p_by_type.setdefault(n.get("type"), []).append(n)
+        g_by_type: Dict[Any, List[Dict[str, Any]]] = {}
+        for n in gnodes:
+            g_by_type.setdefault(n.get("type"), []).append(n)
+        blocks = [(ps, g_by_type[t]) for t, ps in p_by_type.items() if t in g_by_type]
+
+    tp = 0
+    for ps, gs in blocks:
+        weights = _iou_weights(ps, gs)
+        row_ind, col_ind = _linear_sum_assignment_max(weights)
+        if isinstance(weights, list):
+            tp += sum(1 for r, c in zip(row_ind, col_ind) if weights[r][c] >= threshold)
+        else:
+            # Broadcast (numpy) weights: one gather and compare instead of a per-pair loop.
+            tp += int((weights[row_ind, col_ind] >= threshold).sum())
+    return tp
+
+
 def compute_soft_span_f1(pred_nodes: Sequence[Dict[str, Any]], gold_nodes: Sequence[Dict[str, Any]], *, iou_threshold: float = 0.8) -> float:
     """SoftF1 in [0,1] on span-bearing nodes."""
 
@@ -293,21 +431,7 @@ def compute_soft_span_f1(pred_nodes: Sequence[Dict[str, Any]], gold_nodes: Seque
     if not pnodes or not gnodes:
         return 0.0
 
-    weights: List[List[float]] = []
-    for p in pnodes:
-        prow: List[float] = []
-        for g in gnodes:
-            if p.get("type") == g.get("type"):
-                prow.append(_calculate_iou(p.get("span"), g.get("span")))
-            else:
-                prow.append(0.0)
-        weights.append(prow)
-
-    row_ind, col_ind = _linear_sum_assignment_max(weights)
-    tp = 0
-    for r, c in zip(row_ind, col_ind):
-        if float(weights[r][c]) >= float(iou_threshold):
-            tp += 1
+    tp = _count_iou_matches(pnodes, gnodes, iou_threshold=iou_threshold)
     p = tp / len(pnodes)
     r = tp / len(gnodes)
     return float((2 * p * r) / (p + r + 1e-9))
@@ -343,21 +467,7 @@ def compute_defeater_recall(
     if not p_defs:
         return 0.0
 
-    weights: List[List[float]] = []
-    for p in p_defs:
-        prow: List[float] = []
-        for g in g_defs:
-            if p.get("type") == g.get("type"):
-                prow.append(_calculate_iou(p.get("span"), g.get("span")))
-            else:
-                prow.append(0.0)
-        weights.append(prow)
-
-    row_ind, col_ind = _linear_sum_assignment_max(weights)
-    tp = 0
-    for r, c in zip(row_ind, col_ind):
-        if float(weights[r][c]) >= float(iou_threshold):
-            tp += 1
+    tp = _count_iou_matches(p_defs, g_defs, iou_threshold=iou_threshold)
     return float(tp / len(g_defs))
 
 
@@ -385,21 +495,52 @@ def structured_to_flat_tree(structured: Dict[str, Any], *, input_text: str) -> F
         "排除",
     }
 
-    next_id = 0
-
-    def nid(prefix: str) -> str:
-        nonlocal next_id
-        next_id += 1
-        return f"{prefix}{next_id}"
-
     def add_node(*, node_type: str, span: Span, extra: Optional[Dict[str, Any]] = None) -> str:
-        node_id = nid("n")
-        d: Dict[str, Any] = {"id": node_id, "type": node_type, "span": span}
+        # Every node is appended exactly once, so ids n1, n2, ... follow the list length.
+        node_id = f"n{len(nodes) + 1}"
+        d: Dict[str, Any] = {"id": node_id, "type": sys.intern(node_type), "span": span}
         if extra:
             d.update(extra)
         nodes.append(d)
         return node_id
 
+    # All spans are searched in the same text: normalize it once, and resolve repeated
+    # (text, occurrence) pairs once.
+    hay = _norm_ws(input_text)
+    span_memo: Dict[Tuple[str, int], Span] = {}
+
+    def find_span(text: str, occurrence: Any = None) -> Span:
+        key = (_norm_ws(text), _occurrence_index(occurrence))
+        if key not in span_memo:
+            span_memo[key] = _locate_span(hay, key[0], key[1])
+        return span_memo[key]
+
+    def add_leaf(parent_id: str, leaf: Dict[str, Any]) -> None:
+        # Types are interned so the pred x gold type comparisons in TES/IoU hit the identity fast path.
+        tag = sys.intern(str(leaf.get("tag", "") or ""))
+        text = str(leaf.get("text", "") or "")
+        sp = find_span(text)
+        leaf_id = f"n{len(nodes) + 1}"
+        leaf_node = {"id": leaf_id, "type": tag, "span": sp, "text": text, "tag": tag}
+        nodes.append(leaf_node)
+        edges.append((parent_id, leaf_id))
+        if sp is not None:
+            span_nodes.append(leaf_node)
+
+    def add_cond(parent_id: str, cond: Dict[str, Any]) -> None:
+        # Explicit pre-order stack (children pushed reversed), so node ids match a recursive walk.
+        stack: List[Tuple[str, Dict[str, Any]]] = [(parent_id, cond)]
+        while stack:
+            parent, item = stack.pop()
+            if "op" not in item or "items" not in item:
+                add_leaf(parent, item)
+                continue
+            op = str(item.get("op", "")).upper()
+            op_id = add_node(node_type=f"OP:{op}", span=_structural_span())
+            edges.append((parent, op_id))
+            children = [it for it in item.get("items") or [] if isinstance(it, dict)]
+            stack.extend((op_id, it) for it in reversed(children))
+
     root_id = add_node(node_type="ROOT", span=_structural_span())
 
     branches = structured.get("branches") if isinstance(structured.get("branches"), list) else []
@@ -410,7 +551,7 @@ def structured_to_flat_tree(structured: Dict[str, Any], *, input_text: str) -> F
         anch = b.get("anchor")
         anch_text = anch.get("text") if isinstance(anch, dict) else ""
         anch_occ = anch.get("occurrence") if isinstance(anch, dict) else None
-        anch_span = find_span_in_text(text=str(anch_text or ""), input_text=input_text, occurrence=anch_occ)
+        anch_span = find_span(str(anch_text or ""), anch_occ)
         anch_id = add_node(
             node_type="ANCH",
             span=anch_span,
@@ -424,32 +565,6 @@ def structured_to_flat_tree(structured: Dict[str, Any], *, input_text: str) -> F
         modal_id = add_node(node_type=f"MODAL:{str(modal or '').strip()}", span=_structural_span())
         edges.append((anch_id, modal_id))
 
-        def add_leaf(parent_id: str, leaf: Dict[str, Any]) -> None:
-            tag = str(leaf.get("tag", "") or "")
-            text = str(leaf.get("text", "") or "")
-            sp = find_span_in_text(text=text, input_text=input_text)
-            leaf_id = add_node(node_type=tag, span=sp, extra={"text": text, "tag": tag})
-            edges.append((parent_id, leaf_id))
-            if sp is not None:
-                span_nodes.append(nodes[-1])
-
-        def add_cond(parent_id: str, cond: Any) -> None:
-            if not isinstance(cond, dict):
-                return
-            if "op" in cond and "items" in cond:
-                op = str(cond.get("op", "")).upper()
-                op_id = add_node(node_type=f"OP:{op}", span=_structural_span())
-                edges.append((parent_id, op_id))
-                for it in cond.get("items") or []:
-                    if not isinstance(it, dict):
-                        continue
-                    if "op" in it and "items" in it:
-                        add_cond(op_id, it)
-                    else:
-                        add_leaf(op_id, it)
-                return
-            add_leaf(parent_id, cond)
-
         cond = b.get("conditions")
         if isinstance(cond, dict):
             add_cond(modal_id, cond)
@@ -459,7 +574,7 @@ def structured_to_flat_tree(structured: Dict[str, Any], *, input_text: str) -> F
             if not isinstance(eff, dict):
                 continue
             et = str(eff.get("effect_text", "") or "")
-            sp = find_span_in_text(text=et, input_text=input_text)
+            sp = find_span(et)
             eff_id = add_node(node_type="EFFECT", span=sp, extra={"effect_text": et})
             edges.append((anch_id, eff_id))
             if sp is not None:
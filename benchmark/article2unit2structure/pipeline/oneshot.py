@@ -7,11 +7,13 @@ Because each article is processed with a single LLM call, each run stores
 artifacts under a single stage directory:
 
 - `runs/<run_id>/stage1/{meta.json,progress.json,summary.json,units.json,structured_units.json,checkpoints/*.json}`
+  (status changes are journaled to `progress.journal.jsonl` and folded into `progress.json` at the end)
 
 Where:
 - `units.json`: units inferred from model output (for analysis)
 - `structured_units.json`: per-unit SG-DT outputs (st2.v3)
 - `checkpoints/*.json`: prompt + raw response + parsed objects per article
+- `checkpoints.initial.jsonl`: initial payload of every article (until its own checkpoint is written)
 """
 
 from __future__ import annotations
@@ -22,24 +24,31 @@ import os
 import re
 import hashlib
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-from rich.progress import Progress
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from ...common.batching import BatchItem, BatchStateManager, utc_now
 from ...common.dataset import load_article2unit2structure_dataset, input_record
-from ...common.io import read_json, write_json
+from ...common.io import append_jsonl, dumps, loads, read_json, write_json
 from ...common.llm import AsyncLLMClient, extract_final_block
 from ...common.logging import get_logger
 from ...common.model_config import load_model_registry, resolve_model_config
 
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
 
 logger = get_logger(__name__, stage="normbench:article2unit2structure:oneshot")
 
 # Dataset placeholder used in some legacy inputs to indicate missing extracted text.
 MISSING_TEXT_SENTINEL = "未截取到条文"
 
+# Start of a JSON array of objects; candidate positions for salvaging truncated output.
+_ARRAY_START_RE = re.compile(r"\[\s*\{")
+# Separator run between salvaged array items.
+_ITEM_GAP_RE = re.compile(r"[ \t\r\n,]*")
+
 
 def _bool_env(name: str, default: bool) -> bool:
     val = os.getenv(name)
@@ -72,39 +81,63 @@ def _load_prompt(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=8)
+def _load_input_cached(path: str, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    # Released datasets are parsed once, by the (streaming) dataset loader; legacy list files are
+    # recognized by their leading '[' and read whole.
+    with open(path, "rb") as f:
+        is_list = f.read(4096).lstrip()[:1] == b"["
+    if not is_list:
+        # Loader errors (malformed items, not a release file) propagate instead of reading as empty.
+        return tuple(input_record(it) for it in load_article2unit2structure_dataset(Path(path)))
+
+    try:
+        payload = read_json(Path(path))
+    except Exception:
+        payload = None
+
+    if isinstance(payload, list):
+        return tuple(r for r in payload if isinstance(r, dict))
+    return ()
+
+
 def _load_input(path: Path) -> List[Dict[str, Any]]:
     """Load either:
     - released NormBench dataset JSON (top-level dict with `items`)
     - legacy list-of-records JSON (top-level list)
+
+    Results are memoized per (path, mtime), so repeated runs in one process skip re-normalization.
     """
 
-    try:
-        payload = read_json(path)
-    except Exception:
-        payload = None
+    return list(_load_input_cached(str(path.resolve()), path.stat().st_mtime_ns))
 
-    if isinstance(payload, dict) and isinstance(payload.get("items"), list):
-        items = load_article2unit2structure_dataset(path)
-        return [input_record(it) for it in items]
 
-    if isinstance(payload, list):
-        return [r for r in payload if isinstance(r, dict)]
-    return []
+def _load_records(json_path: Path, journal_glob: str, *, key: str) -> Dict[Any, Dict[str, Any]]:
+    """Records from a JSON list output, updated by any per-shard JSONL append journals next to it."""
+
+    records = {r.get(key): r for r in (read_json(json_path) or [])} if json_path.exists() else {}
+    for journal in sorted(json_path.parent.glob(journal_glob)):
+        for line in journal.read_bytes().splitlines():
+            if not line.strip():
+                continue
+            try:
+                rec = loads(line)
+            except ValueError:
+                # Torn trailing append from an interrupted run; the article is retried on resume.
+                continue
+            if isinstance(rec, dict):
+                records[rec.get(key)] = rec
+    return records
+
+
+_RULE_TEXT_KEYS = ("article_text", "rule_text", "full_article_text", "article_full")
 
 
 def _rule_text(rec: Dict[str, Any]) -> str:
-    v = rec.get("article_text")
-    if isinstance(v, str) and v and MISSING_TEXT_SENTINEL not in v:
-        return v
-    v = rec.get("rule_text")
-    if isinstance(v, str) and v and MISSING_TEXT_SENTINEL not in v:
-        return v
-    v = rec.get("full_article_text")
-    if isinstance(v, str) and v and MISSING_TEXT_SENTINEL not in v:
-        return v
-    v = rec.get("article_full")
-    if isinstance(v, str) and v and MISSING_TEXT_SENTINEL not in v:
-        return v
+    for k in _RULE_TEXT_KEYS:
+        v = rec.get(k)
+        if isinstance(v, str) and v and MISSING_TEXT_SENTINEL not in v:
+            return v
     return ""
 
 
@@ -118,143 +151,150 @@ def _full_article_text(rec: Dict[str, Any], *, fallback: str) -> str:
     return fallback
 
 
-def _build_sample_id(rec: Dict[str, Any]) -> str:
-    rid = (rec.get("rule_id") or "").strip()
-    if not rid:
-        return ""
-    raw_id = rid
+def _truncate_id(raw_id: str, *, max_bytes: int, prefix_bytes: int) -> str:
+    """Return `raw_id`, or a UTF-8 prefix plus a short MD5 suffix when it exceeds `max_bytes`."""
 
+    # UTF-8 never takes more than 4 bytes per character, so short ids need no encoding.
+    if len(raw_id) * 4 <= max_bytes:
+        return raw_id
     raw_bytes = raw_id.encode("utf-8", errors="ignore")
-    if len(raw_bytes) <= 200:
+    if len(raw_bytes) <= max_bytes:
         return raw_id
-    prefix = raw_bytes[:160].decode("utf-8", errors="ignore")
-    import hashlib as _hashlib
-
-    h = _hashlib.md5(raw_bytes).hexdigest()[:8]
+    prefix = raw_bytes[:prefix_bytes].decode("utf-8", errors="ignore")
+    h = hashlib.md5(raw_bytes).hexdigest()[:8]  # noqa: S324 - stable id suffix
     return f"{prefix}|{h}"
 
 
+def _build_sample_id(rec: Dict[str, Any]) -> str:
+    rid = (rec.get("rule_id") or "").strip()
+    if not rid:
+        return ""
+    return _truncate_id(rid, max_bytes=200, prefix_bytes=160)
+
+
 def _build_unit_sample_id(rule_id: str, unit_id: str) -> str:
-    base = f"{rule_id}|{unit_id}"
-    raw_id = base
+    return _truncate_id(f"{rule_id}|{unit_id}", max_bytes=220, prefix_bytes=170)
 
-    raw_bytes = raw_id.encode("utf-8", errors="ignore")
-    if len(raw_bytes) <= 220:
-        return raw_id
-    prefix = raw_bytes[:170].decode("utf-8", errors="ignore")
-    import hashlib as _hashlib
 
-    h = _hashlib.md5(raw_bytes).hexdigest()[:8]
-    return f"{prefix}|{h}"
+def _strip_json_fence(content: str) -> str:
+    """Return the body of a leading ```json ... ``` fence, or `content` unchanged.
 
+    Only the text between the first two fences is kept; slicing avoids splitting the whole payload.
+    """
 
-def _parse_final_json_array(raw: str) -> List[Dict[str, Any]]:
-    content = (extract_final_block(raw) or raw).strip()
     # Some models wrap JSON in fenced code blocks: ```json ... ```
-    if content.startswith("```"):
-        parts = content.split("```")
-        if len(parts) >= 3:
-            content = parts[1].strip()
-            if content.lower().startswith("json"):
-                content = content[4:].strip()
+    if not content.startswith("```"):
+        return content
+    end = content.find("```", 3)
+    if end < 0:
+        return content
+    body = content[3:end].strip()
+    if body[:4].lower() == "json":
+        body = body[4:].strip()
+    return body
+
+
+def _prepare_json_content(raw: str) -> str:
+    """`<final>` body (or the raw text) with surrounding whitespace and a JSON fence removed."""
+
+    return _strip_json_fence((extract_final_block(raw) or raw).strip())
+
+
+def _try_load_json_array(content: str) -> Optional[List[Dict[str, Any]]]:
+    """Decode prepared content as a list of dicts; None if it is not valid JSON."""
+
     try:
-        obj = json.loads(content)
-        if isinstance(obj, list):
-            return [x for x in obj if isinstance(x, dict)]
-        # Some models may output a single object instead of an array (equivalent to 1 unit).
-        if isinstance(obj, dict):
-            return [obj]
-        return []
+        obj = loads(content)
     except Exception:
-        # Best-effort salvage for truncated JSON arrays, e.g. when completion_tokens hits the cap
-        # and the model output is cut off mid-array. We try to recover as many complete dict items
-        # as possible by incrementally decoding objects after a `[` that looks like a list of dicts.
-        decoder = json.JSONDecoder()
-
-        def looks_like_unit_or_struct(obj: Dict[str, Any]) -> bool:
-            # One-call output commonly contains either:
-            # - Unit+Structure wrapper: {unit_id, unit_text, unit_reason, structure:{...}}
-            # - Direct st2.v3 object: {schema_version, rule_id, unit_id, branches, ...}
-            if isinstance(obj.get("structure"), dict) and isinstance(obj.get("unit_id"), str):
-                return True
-            if isinstance(obj.get("schema_version"), str) and isinstance(obj.get("branches"), list):
-                return True
-            return False
-
-        best: List[Dict[str, Any]] = []
-        best_score = -1
-        best_len = -1
-        for m in re.finditer(r"\[\s*\{", content):
-            start = m.start()
-            i = start + 1
-            items: List[Dict[str, Any]] = []
-            while i < len(content):
-                # Skip whitespace / commas between items.
-                while i < len(content) and content[i] in " \t\r\n,":
-                    i += 1
-                if i >= len(content) or content[i] == "]":
-                    break
-                try:
-                    val, j = decoder.raw_decode(content, i)
-                except Exception:
-                    break
-                if isinstance(val, dict):
-                    items.append(val)
-                i = j
-            score = sum(1 for it in items if looks_like_unit_or_struct(it))
-            if score > best_score or (score == best_score and len(items) > best_len):
-                best = items
-                best_score = score
-                best_len = len(items)
-
-        if best_score > 0 and best:
-            return best
-
-        start = content.rfind("[")
-        end = content.rfind("]")
-        if start != -1 and end != -1 and end > start:
-            try:
-                obj = json.loads(content[start : end + 1])
-                if isinstance(obj, list):
-                    return [x for x in obj if isinstance(x, dict)]
-            except Exception:
-                # The last [] may belong to a nested field (e.g., effects/items). Keep falling back.
-                pass
-        # Final fallback: try to slice a complete {...} object (for truncated arrays or missing brackets).
-        start = content.find("{")
-        end = content.rfind("}")
-        if start != -1 and end != -1 and end > start:
+        return None
+    if isinstance(obj, list):
+        return [x for x in obj if isinstance(x, dict)]
+    # Some models may output a single object instead of an array (equivalent to 1 unit).
+    if isinstance(obj, dict):
+        return [obj]
+    return []
+
+
+def _salvage_json_array(content: str) -> List[Dict[str, Any]]:
+    # Best-effort salvage for truncated JSON arrays, e.g. when completion_tokens hits the cap
+    # and the model output is cut off mid-array. We try to recover as many complete dict items
+    # as possible by incrementally decoding objects after a `[` that looks like a list of dicts.
+    decoder = json.JSONDecoder()
+
+    def looks_like_unit_or_struct(obj: Dict[str, Any]) -> bool:
+        # One-call output commonly contains either:
+        # - Unit+Structure wrapper: {unit_id, unit_text, unit_reason, structure:{...}}
+        # - Direct st2.v3 object: {schema_version, rule_id, unit_id, branches, ...}
+        if isinstance(obj.get("structure"), dict) and isinstance(obj.get("unit_id"), str):
+            return True
+        if isinstance(obj.get("schema_version"), str) and isinstance(obj.get("branches"), list):
+            return True
+        return False
+
+    best: List[Dict[str, Any]] = []
+    best_score = -1
+    best_len = -1
+    for m in _ARRAY_START_RE.finditer(content):
+        start = m.start()
+        i = start + 1
+        items: List[Dict[str, Any]] = []
+        while i < len(content):
+            # Skip whitespace / commas between items.
+            i = _ITEM_GAP_RE.match(content, i).end()
+            if i >= len(content) or content[i] == "]":
+                break
             try:
-                obj = json.loads(content[start : end + 1])
-                if isinstance(obj, dict):
-                    return [obj]
+                val, j = decoder.raw_decode(content, i)
             except Exception:
-                return []
+                break
+            if isinstance(val, dict):
+                items.append(val)
+            i = j
+        score = sum(1 for it in items if looks_like_unit_or_struct(it))
+        if score > best_score or (score == best_score and len(items) > best_len):
+            best = items
+            best_score = score
+            best_len = len(items)
+
+    if best_score > 0 and best:
+        return best
+
+    start = content.rfind("[")
+    end = content.rfind("]")
+    if start != -1 and end != -1 and end > start:
+        try:
+            obj = loads(content[start : end + 1])
+            if isinstance(obj, list):
+                return [x for x in obj if isinstance(x, dict)]
+        except Exception:
+            # The last [] may belong to a nested field (e.g., effects/items). Keep falling back.
+            pass
+    # Final fallback: try to slice a complete {...} object (for truncated arrays or missing brackets).
+    start = content.find("{")
+    end = content.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        try:
+            obj = loads(content[start : end + 1])
+            if isinstance(obj, dict):
+                return [obj]
+        except Exception:
+            return []
     return []
 
 
+def _parse_final_json_array(raw: str) -> List[Dict[str, Any]]:
+    content = _prepare_json_content(raw)
+    parsed = _try_load_json_array(content)
+    return parsed if parsed is not None else _salvage_json_array(content)
+
+
 def _strict_parse_json_array(raw: str) -> Optional[List[Dict[str, Any]]]:
     """Strict JSON parsing without salvage.
 
     Returns None if JSON is invalid (e.g. truncated / extra trailing text).
     """
 
-    content = (extract_final_block(raw) or raw).strip()
-    if content.startswith("```"):
-        parts = content.split("```")
-        if len(parts) >= 3:
-            content = parts[1].strip()
-            if content.lower().startswith("json"):
-                content = content[4:].strip()
-    try:
-        obj = json.loads(content)
-    except Exception:
-        return None
-    if isinstance(obj, list):
-        return [x for x in obj if isinstance(x, dict)]
-    if isinstance(obj, dict):
-        return [obj]
-    return []
+    return _try_load_json_array(_prepare_json_content(raw))
 
 
 def _maybe_system_prompt(model_alias: str, *, enable_thinking: bool) -> Optional[str]:
@@ -300,6 +340,19 @@ def _merge_extra_params(*parts: Optional[Dict[str, Any]]) -> Optional[Dict[str,
     return merged or None
 
 
+# Parsed JSON values are str/bool/int/float/list/dict or None, so a None check covers the type filter.
+_WRAPPER_FILL_KEYS = (
+    "schema_version",
+    "rule_id",
+    "law_title",
+    "article_number",
+    "rule_text",
+    "unit_id",
+    "unit_text",
+    "unit_reason",
+)
+
+
 def _normalize_to_st2_objects(parsed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Accept either:
     - st2.v3 objects directly
@@ -315,24 +368,32 @@ def _normalize_to_st2_objects(parsed: List[Dict[str, Any]]) -> List[Dict[str, An
         if isinstance(inner, dict):
             st2_obj = dict(inner)
             # Fill missing fields from wrapper if present (some models may omit them inside `structure`).
-            for k in (
-                "schema_version",
-                "rule_id",
-                "law_title",
-                "article_number",
-                "rule_text",
-                "unit_id",
-                "unit_text",
-                "unit_reason",
-            ):
-                if k not in st2_obj and isinstance(obj.get(k), (str, bool, int, float, list, dict)):
-                    st2_obj[k] = obj[k]
+            for k in _WRAPPER_FILL_KEYS:
+                v = obj.get(k)
+                if v is not None and k not in st2_obj:
+                    st2_obj[k] = v
             normalized.append(st2_obj)
         else:
             normalized.append(obj)
     return normalized
 
 
+# Responses at least this long are parsed in a worker thread so other in-flight requests keep being serviced.
+_OFFLOAD_PARSE_CHARS = 64 * 1024
+
+
+def _parse_and_normalize(parse_source: str) -> List[Dict[str, Any]]:
+    """Decode a model response into normalized st2.v3 objects (strict decode first, salvage on failure).
+
+    `parse_source` is `resp.final` or, when the client found no `<final>` block, the raw content;
+    the client already ran `extract_final_block`, so only the JSON fence is stripped here.
+    """
+
+    content = _strip_json_fence(parse_source.strip())
+    strict_list = _try_load_json_array(content)
+    return _normalize_to_st2_objects(strict_list if strict_list is not None else _salvage_json_array(content))
+
+
 def run(
     *,
     batch_id: str,
@@ -360,10 +421,13 @@ def run(
     all_records = _load_input(input_path)
     want_sub = {s for s in (subsets or []) if isinstance(s, str) and s.strip()}
     want_lang = {s for s in (languages or []) if isinstance(s, str) and s.strip()}
-    if want_sub:
-        all_records = [r for r in all_records if str(r.get("subset") or "") in want_sub]
-    if want_lang:
-        all_records = [r for r in all_records if str(r.get("language") or "") in want_lang]
+    if want_sub or want_lang:
+        all_records = [
+            r
+            for r in all_records
+            if (not want_sub or str(r.get("subset") or "") in want_sub)
+            and (not want_lang or str(r.get("language") or "") in want_lang)
+        ]
     records = all_records[:limit] if limit else all_records
     if not records:
         raise ValueError(f"输入为空：{input_path}")
@@ -478,7 +542,8 @@ def run(
             write_meta=True,
         )
 
-    tmpl = _load_prompt(prompt_file)
+    # Every prompt is this template followed by the article's input JSON.
+    prompt_head = _load_prompt(prompt_file).rstrip() + "\n\n"
     sample_ids_all = list(manager.iter_samples(("pending", "error", "running"), limit=limit))
     ns = max(1, int(num_shards))
     sid = int(shard_id)
@@ -486,23 +551,38 @@ def run(
         raise ValueError(f"Invalid shard_id={shard_id}, must be within [0, {ns})")
 
     def _pick(sample_id: str) -> bool:
-        h = hashlib.md5(sample_id.encode("utf-8", errors="ignore")).hexdigest()  # noqa: S324 - deterministic sharding
-        return (int(h[:8], 16) % ns) == sid
+        # MD5 keeps shard assignment stable across processes and releases (resume relies on it);
+        # the leading 4 digest bytes equal the first 8 hex digits, without building the hex string.
+        h = hashlib.md5(sample_id.encode("utf-8", errors="ignore")).digest()  # noqa: S324 - deterministic sharding
+        return (int.from_bytes(h[:4], "big") % ns) == sid
 
     sample_ids = [s for s in sample_ids_all if _pick(s)] if ns > 1 else sample_ids_all
+
+    # Finished articles are appended to per-shard journals during the run (O(1) per article) and
+    # folded into units.json / structured_units.json once at the end.
+    units_journal = stage_dir / f"units.shard{sid}.jsonl"
+    structured_journal = stage_dir / f"structured_units.shard{sid}.jsonl"
+
+    def _compact_outputs() -> Tuple[Dict[Any, Dict[str, Any]], Dict[Any, Dict[str, Any]]]:
+        units = _load_records(units_out, "units.shard*.jsonl", key="rule_id")
+        structured = _load_records(structured_out, "structured_units.shard*.jsonl", key="unit_key")
+        write_json(units_out, list(units.values()))
+        write_json(structured_out, list(structured.values()))
+        units_journal.unlink(missing_ok=True)
+        structured_journal.unlink(missing_ok=True)
+        return units, structured
+
+    # Fold journals left by an interrupted run before deciding there is nothing left to do.
+    if units_journal.exists() or structured_journal.exists():
+        _compact_outputs()
+
     if not sample_ids:
         logger.info("No pending samples (shard=%s/%s). Reusing existing outputs.", sid, ns)
         return structured_out
 
     # Build a full map to keep `--resume` robust even if the caller changes `--limit`.
-    def _norm_rid(v: Any) -> str:
-        return str(v or "").rstrip("|").strip()
-
-    rec_map = {rec.get("rule_id"): rec for rec in all_records if isinstance(rec, dict)}
-    existing_units = {r.get("rule_id"): r for r in (read_json(units_out) or [])} if units_out.exists() else {}
-    existing_structured = (
-        {r.get("unit_key"): r for r in (read_json(structured_out) or [])} if structured_out.exists() else {}
-    )
+    # Keys are stripped exactly like the checkpoint payload rule_id that process_one looks up.
+    rec_map = {(rec.get("rule_id") or "").strip(): rec for rec in all_records if isinstance(rec, dict)}
 
     total_task = None
     if progress is not None:
@@ -510,13 +590,14 @@ def run(
 
     thinking_params = _maybe_extra_params(model_alias, enable_thinking)
 
-    async def process_one(client: AsyncLLMClient, sample_id: str, *, persist_lock: asyncio.Lock) -> None:
+    async def process_one(client: AsyncLLMClient, sample_id: str, *, persist_queue: asyncio.Queue) -> None:
         checkpoint = manager.read_checkpoint(sample_id)
         if checkpoint.get("status") == "done":
             if progress is not None and total_task is not None:
                 progress.advance(total_task)
             return
 
+        # A single small journal append; cheaper inline than a thread hop.
         manager.update_status(sample_id=sample_id, new_status="running")
 
         rid = (checkpoint.get("payload") or {}).get("rule_id") if isinstance(checkpoint.get("payload"), dict) else ""
@@ -525,8 +606,8 @@ def run(
         rule_text = _rule_text(rec)
         full_article_text = _full_article_text(rec, fallback=rule_text)
         if not rid or not rule_text:
-            manager.update_status(sample_id=sample_id, new_status="error")
-            manager.write_checkpoint(
+            await manager.aupdate_status(sample_id=sample_id, new_status="error")
+            await manager.awrite_checkpoint(
                 sample_id,
                 {
                     **checkpoint,
@@ -545,7 +626,7 @@ def run(
             "rule_text": rule_text,
             "full_article_text": full_article_text,
         }
-        prompt = tmpl.rstrip() + "\n\n" + json.dumps(input_obj, ensure_ascii=False, indent=2)
+        prompt = prompt_head + dumps(input_obj, indent=2)
         messages = []
         system_prompt = _maybe_system_prompt(model_alias, enable_thinking=enable_thinking)
         if system_prompt:
@@ -564,8 +645,8 @@ def run(
                 ),
             )
         except Exception as exc:  # noqa: BLE001
-            manager.update_status(sample_id=sample_id, new_status="error")
-            manager.write_checkpoint(
+            await manager.aupdate_status(sample_id=sample_id, new_status="error")
+            await manager.awrite_checkpoint(
                 sample_id,
                 {
                     **checkpoint,
@@ -581,11 +662,13 @@ def run(
         used_resp = resp
         raw_content = resp.raw_content
         parse_source = resp.final if resp.final else raw_content
-        strict_list = _strict_parse_json_array(parse_source)
-        structured_list = _normalize_to_st2_objects(strict_list if strict_list is not None else _parse_final_json_array(parse_source))
+        if len(parse_source) >= _OFFLOAD_PARSE_CHARS:
+            structured_list = await asyncio.to_thread(_parse_and_normalize, parse_source)
+        else:
+            structured_list = _parse_and_normalize(parse_source)
         if not structured_list:
-            manager.update_status(sample_id=sample_id, new_status="error")
-            manager.write_checkpoint(
+            await manager.aupdate_status(sample_id=sample_id, new_status="error")
+            await manager.awrite_checkpoint(
                 sample_id,
                 {
                     **checkpoint,
@@ -619,8 +702,8 @@ def run(
             units.append({"unit_id": unit_id, "unit_text": unit_text, "unit_reason": unit_reason})
 
         if not units:
-            manager.update_status(sample_id=sample_id, new_status="error")
-            manager.write_checkpoint(
+            await manager.aupdate_status(sample_id=sample_id, new_status="error")
+            await manager.awrite_checkpoint(
                 sample_id,
                 {
                     **checkpoint,
@@ -662,7 +745,11 @@ def run(
         }
 
         # 逐 unit 的结构化结果（与参考两步流程的 unit-level 输出形态一致：unit_key + structured + llm_meta）
-        unit_count = len(structured_list)
+        # Every unit of one response carries identical metadata, so the units share a single dict.
+        unit_llm_meta = {
+            **stage1_record["llm_meta"],
+            "units_in_response": len(structured_list),
+        }
         structured_records_local: Dict[str, Dict[str, Any]] = {}
         for st2_obj in structured_list:
             unit_id = st2_obj.get("unit_id") if isinstance(st2_obj.get("unit_id"), str) else ""
@@ -673,51 +760,55 @@ def run(
                 "unit_key": unit_key,
                 "full_article_text": full_article_text,
                 "structured": st2_obj,
-                "llm_meta": {
-                    "model_alias": model_alias,
-                    "latency_seconds": resp_meta.latency_seconds,
-                    "usage": resp_meta.usage,
-                    "model": resp_meta.model,
-                    "prompt_path": str(prompt_file),
-                    "call_mode": "one_call",
-                    "units_in_response": unit_count,
-                },
+                "llm_meta": unit_llm_meta,
             }
 
-        manager.update_status(sample_id=sample_id, new_status="done")
-        manager.write_checkpoint(
-            sample_id,
-            {
-                **checkpoint,
-                "status": "done",
-                # Clear any previous error payload from earlier failed attempts.
-                "error": None,
-                "prompt": prompt,
-                "model_raw": {
-                    "content": raw_content,
-                    "final": resp_meta.final,
-                    "reasoning_content": getattr(resp_meta, "reasoning_content", None),
-                    "model": resp_meta.model,
-                    "usage": resp_meta.usage,
-                },
-                "parsed": structured_list,
-                "result": {
-                    "units_record": stage1_record,
-                    "structured_units": list(structured_records_local.values()),
-                },
+        done_checkpoint = {
+            **checkpoint,
+            "status": "done",
+            # Clear any previous error payload from earlier failed attempts.
+            "error": None,
+            "prompt": prompt,
+            "model_raw": {
+                "content": raw_content,
+                "final": resp_meta.final,
+                "reasoning_content": getattr(resp_meta, "reasoning_content", None),
+                "model": resp_meta.model,
+                "usage": resp_meta.usage,
             },
-        )
-
-        async with persist_lock:
-            existing_units[rid] = stage1_record
-            for k, v in structured_records_local.items():
-                existing_structured[k] = v
-            write_json(units_out, list(existing_units.values()))
-            write_json(structured_out, list(existing_structured.values()))
+            "parsed": structured_list,
+            "result": {
+                "units_record": stage1_record,
+                "structured_units": list(structured_records_local.values()),
+            },
+        }
+        await persist_queue.put((sample_id, done_checkpoint, stage1_record, structured_records_local))
 
         if progress is not None and total_task is not None:
             progress.advance(total_task)
 
+    def _persist_done(batch: List[Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Dict[str, Any]]]]) -> None:
+        # Journal before marking done: an article whose append was cut short is retried on resume.
+        append_jsonl(units_journal, [item[2] for item in batch])
+        append_jsonl(structured_journal, [rec for item in batch for rec in item[3].values()])
+        manager.update_statuses({item[0]: "done" for item in batch})
+        for sample_id, done_checkpoint, _units_record, _structured in batch:
+            manager.write_checkpoint(sample_id, done_checkpoint)
+
+    async def persister(persist_queue: asyncio.Queue) -> None:
+        # Single consumer: drain everything finished since the last flush and persist it together,
+        # so K completed articles cost one status-journal append instead of K.
+        while True:
+            batch = [await persist_queue.get()]
+            while not persist_queue.empty():
+                batch.append(persist_queue.get_nowait())
+            finished = [item for item in batch if item is not None]
+            if finished:
+                # Off the event loop: in-flight requests keep being serviced while the batch is written.
+                await asyncio.to_thread(_persist_done, finished)
+            if len(finished) < len(batch):
+                return
+
     async def runner() -> None:
         client = AsyncLLMClient(
             model_alias,
@@ -726,24 +817,30 @@ def run(
             request_timeout=request_timeout,
             retries=2,
         )
-        persist_lock = asyncio.Lock()
-        sem = asyncio.Semaphore(max(1, max_concurrency))
+        persist_queue: asyncio.Queue = asyncio.Queue()
+        persist_task = asyncio.create_task(persister(persist_queue))
+        # A fixed pool of workers pulling from one iterator: only `max_concurrency` coroutines exist
+        # at a time instead of one Task per sample.
+        pending_ids = iter(sample_ids)
 
-        async def _task(sid: str) -> None:
-            async with sem:
-                await process_one(client, sid, persist_lock=persist_lock)
+        async def _worker() -> None:
+            for sid in pending_ids:
+                await process_one(client, sid, persist_queue=persist_queue)
 
         try:
-            await asyncio.gather(*[asyncio.create_task(_task(sid)) for sid in sample_ids])
+            await asyncio.gather(*[_worker() for _ in range(min(max(1, max_concurrency), len(sample_ids)))])
         finally:
+            # Sentinel: flush what is queued, then stop the persister.
+            await persist_queue.put(None)
+            await persist_task
             await client.aclose()
 
     asyncio.run(runner())
 
     # Finalize outputs and summaries
-    write_json(units_out, list(existing_units.values()))
-    write_json(structured_out, list(existing_structured.values()))
+    _, existing_structured = _compact_outputs()
 
+    manager.compact_progress()
     p_state = manager.load_progress() or {}
     totals = p_state.get("totals") if isinstance(p_state, dict) else {}
     summary_obj = {
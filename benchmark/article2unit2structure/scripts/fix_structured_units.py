@@ -14,9 +14,14 @@ This helper unwraps the nested `structure` object, and ensures `unit_key` exists
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-from ...common.io import read_json, write_json
+from ...common.io import read_json, write_json_array
+
+try:  # optional dependency: incremental JSON parsing
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None
 
 
 def _as_dict(obj: Any) -> Dict[str, Any]:
@@ -39,20 +44,26 @@ def _norm_rule_id(rule_id: Optional[str]) -> Optional[str]:
 
 
 def _unwrap_structured(record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
-    """Return (new_record, changed)."""
+    """Return (new_record, changed).
+
+    Already-normalized records are returned as-is; the record is copied on the first change.
+    """
 
     changed = False
-    out = dict(record)
+    out = record
 
     structured = _as_dict(out.get("structured"))
     # Case A: structured is {unit_id, unit_text, unit_reason, structure:<st2.v3>}
     if "structure" in structured and isinstance(structured.get("structure"), dict):
+        out = dict(out)
         out["structured"] = structured["structure"]
         changed = True
         structured = out["structured"]
 
     # Case B: record itself is already the unit+structure pair (legacy exports)
     if "structured" not in out and isinstance(out.get("structure"), dict):
+        if not changed:
+            out = dict(out)
         out["structured"] = out["structure"]
         changed = True
         structured = out["structured"]
@@ -62,12 +73,16 @@ def _unwrap_structured(record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
     st_rule_id = _norm_rule_id(st.get("rule_id"))
     if st_rule_id and st.get("rule_id") != st_rule_id:
         st["rule_id"] = st_rule_id
+        if not changed:
+            out = dict(out)
         out["structured"] = st
         structured = st
         changed = True
 
     out_rule_id = _norm_rule_id(out.get("rule_id") if isinstance(out.get("rule_id"), str) else None)
     if out_rule_id and out.get("rule_id") != out_rule_id:
+        if not changed:
+            out = dict(out)
         out["rule_id"] = out_rule_id
         changed = True
 
@@ -80,6 +95,8 @@ def _unwrap_structured(record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
             or (out.get("unit_id") if isinstance(out.get("unit_id"), str) else None),
         )
         if key:
+            if not changed:
+                out = dict(out)
             out["unit_key"] = key
             changed = True
     else:
@@ -88,6 +105,8 @@ def _unwrap_structured(record: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
             rid, uid = unit_key.split("#", 1)
             rid_norm = _norm_rule_id(rid)
             if rid_norm and rid_norm != rid:
+                if not changed:
+                    out = dict(out)
                 out["unit_key"] = f"{rid_norm}#{uid}"
                 changed = True
 
@@ -106,19 +125,26 @@ def fix_structured_units(structured_path: Path, units_path: Path, fixed_path: Pa
         Path to the fixed structured_units.json (always `fixed_path` when successful).
     """
 
+    if ijson is not None and _is_json_array(structured_path):
+        # Stream records from input to output; only one record is held at a time.
+        try:
+            with structured_path.open("rb") as f:
+                records = (rec for rec in ijson.items(f, "item", use_float=True) if isinstance(rec, dict))
+                write_json_array(fixed_path, (_unwrap_structured(rec)[0] for rec in records))
+            return fixed_path
+        except ijson.JSONError:
+            # e.g. NaN, which only the stdlib parser accepts: fall back to a whole-file parse.
+            pass
+
     payload = read_json(structured_path)
     if not isinstance(payload, list):
         raise ValueError(f"structured_units.json must be a list: {structured_path}")
 
-    fixed: List[Dict[str, Any]] = []
-    any_changed = False
-    for rec in payload:
-        if not isinstance(rec, dict):
-            continue
-        new_rec, changed = _unwrap_structured(rec)
-        fixed.append(new_rec)
-        any_changed = any_changed or changed
-
     # Always write: evaluation code points to fixed_path.
-    write_json(fixed_path, fixed)
+    write_json_array(fixed_path, (_unwrap_structured(rec)[0] for rec in payload if isinstance(rec, dict)))
     return fixed_path
+
+
+def _is_json_array(path: Path) -> bool:
+    with path.open("rb") as f:
+        return f.read(4096).lstrip()[:1] == b"["
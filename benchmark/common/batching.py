@@ -7,10 +7,13 @@ State management utilities for batched runs (progress, checkpoints, resume).
 from __future__ import annotations
 
 import asyncio
+import os
+import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 import re
 
 from . import io
@@ -19,10 +22,18 @@ ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 BATCH_SUFFIX_PATTERN = re.compile(r".*_\d{8}_\d{6}$")
 
 
+_utc_second: Tuple[int, str] = (-1, "")
+
+
 def utc_now() -> str:
-    """Return current UTC time string."""
+    """Return current UTC time string (`ISO_FORMAT`)."""
 
-    return datetime.now(timezone.utc).strftime(ISO_FORMAT)
+    global _utc_second
+    sec, usec = divmod(time.time_ns() // 1000, 1_000_000)
+    # Checkpoint/status writes come in bursts; format the seconds part once per second.
+    if sec != _utc_second[0]:
+        _utc_second = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{_utc_second[1]}.{usec:06d}Z"
 
 
 def ensure_timestamp_suffix(label: str) -> str:
@@ -51,6 +62,28 @@ class BatchItem:
     metadata: Dict[str, object] = field(default_factory=dict)
 
 
+def _status_entry(sample_id: str, new_status: str, old_status: Optional[str]) -> Dict[str, object]:
+    entry: Dict[str, object] = {"sample_id": sample_id, "new_status": new_status, "updated_at": utc_now()}
+    if old_status:
+        entry["old_status"] = old_status
+    return entry
+
+
+def _apply_status(progress: Dict[str, object], sample_id: str, new_status: str, old_status: Optional[str]) -> None:
+    """Move one sample to `new_status` and adjust the aggregate counters."""
+
+    samples = progress["samples"]
+    totals = progress["totals"]
+
+    current = old_status or samples.get(sample_id)
+    if current and current in totals:
+        totals[current] = max(0, totals[current] - 1)
+    totals.setdefault(new_status, 0)
+    totals[new_status] += 1
+
+    samples[sample_id] = sys.intern(new_status)
+
+
 class BatchStateManager:
     """Manage batch state and support resume via checkpoints."""
 
@@ -58,6 +91,15 @@ class BatchStateManager:
         self.batch_dir = batch_dir
         self.checkpoint_dir = batch_dir / "checkpoints"
         self.progress_path = batch_dir / "progress.json"
+        # Status transitions are appended here and folded into progress.json by `compact_progress`.
+        self.progress_journal_path = batch_dir / "progress.journal.jsonl"
+        self._journal_checked = False
+        # Parsed snapshot + replayed journal, refreshed incrementally by `_current_progress`.
+        self._progress_cache: Optional[Dict[str, object]] = None
+        self._progress_cache_key: Optional[Tuple[object, ...]] = None
+        # Initial (pending) checkpoints of every sample, written once by `init_progress`.
+        self.initial_checkpoints_path = batch_dir / "checkpoints.initial.jsonl"
+        self._initial_checkpoints: Optional[Dict[str, Dict[str, object]]] = None
         self.meta_path = meta_path or (batch_dir / "meta.json")
 
     def ensure_structure(self) -> None:
@@ -93,6 +135,7 @@ class BatchStateManager:
             "samples": samples,
             "updated_at": utc_now(),
         }
+        self.progress_journal_path.unlink(missing_ok=True)
         io.write_json(self.progress_path, progress)
 
         if write_meta:
@@ -106,15 +149,23 @@ class BatchStateManager:
                 meta.update(extra_meta)
             io.write_json(self.meta_path, meta)
 
-        for item in items:
-            self.write_checkpoint(
-                item.sample_id,
+        # One JSONL file instead of a checkpoint file per sample; `read_checkpoint` falls back to it
+        # until the sample's own checkpoint is written.
+        now = utc_now()
+        io.write_jsonl(
+            self.initial_checkpoints_path,
+            [
                 {
+                    "sample_id": item.sample_id,
                     "status": "pending",
                     "payload": item.payload,
                     "metadata": item.metadata,
-                },
-            )
+                    "updated_at": now,
+                }
+                for item in items
+            ],
+        )
+        self._initial_checkpoints = None
 
     def load_meta(self) -> Dict[str, object]:
         """Load meta.json."""
@@ -122,9 +173,46 @@ class BatchStateManager:
         return io.read_json(self.meta_path)
 
     def load_progress(self) -> Dict[str, object]:
-        """Load progress.json."""
-
-        return io.read_json(self.progress_path)
+        """Load progress.json with any journaled status transitions applied."""
+
+        progress = self._current_progress()
+        return {**progress, "samples": dict(progress["samples"]), "totals": dict(progress["totals"])}
+
+    def _current_progress(self) -> Dict[str, object]:
+        """Shared (read-only) progress state; reparsed only when progress.json itself changes.
+
+        While the snapshot is unchanged, only journal lines appended since the last call are replayed.
+        """
+
+        st = self.progress_path.stat()
+        snapshot_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        # Journals left by an interrupted `compact_progress` come first: they predate the live one.
+        leftovers = sorted(self.batch_dir.glob(self.progress_journal_path.name + ".*"))
+        cached = self._progress_cache_key
+        if self._progress_cache is not None and cached is not None and not leftovers and cached[0] == snapshot_key:
+            journal_ino, offset = cached[1], cached[2]
+            try:
+                jst = self.progress_journal_path.stat()
+                same_journal = jst.st_ino == journal_ino and jst.st_size >= offset
+            except FileNotFoundError:
+                same_journal = journal_ino is None
+            if same_journal:
+                if journal_ino is not None:
+                    _, offset = self._replay_journal(self._progress_cache, self.progress_journal_path, start=offset)
+                self._progress_cache_key = (snapshot_key, journal_ino, offset)
+                return self._progress_cache
+
+        progress = io.read_json(self.progress_path)
+        # Statuses come from a handful of values; share one string each instead of one per sample.
+        samples = progress["samples"]
+        for sample_id, status in samples.items():
+            samples[sample_id] = sys.intern(status)
+        for path in leftovers:
+            self._replay_journal(progress, path)
+        journal_ino, offset = self._replay_journal(progress, self.progress_journal_path)
+        self._progress_cache = progress
+        self._progress_cache_key = (snapshot_key, journal_ino, offset)
+        return progress
 
     def update_status(
         self,
@@ -133,27 +221,90 @@ class BatchStateManager:
         old_status: Optional[str] = None,
         new_status: str,
     ) -> None:
-        """Update a sample status and adjust aggregate counters."""
+        """Record a sample status change (one journal append; progress.json is not rewritten)."""
 
-        progress = self.load_progress()
-        samples = progress["samples"]
-        totals = progress["totals"]
+        self._append_status_entries([_status_entry(sample_id, new_status, old_status)])
+
+    def update_statuses(self, statuses: Mapping[str, str]) -> None:
+        """Record several `update_status` transitions with a single journal append."""
+
+        if not statuses:
+            return
+        self._append_status_entries(
+            [_status_entry(sample_id, new_status, None) for sample_id, new_status in statuses.items()]
+        )
 
-        current = old_status or samples.get(sample_id)
-        if current and current in totals:
-            totals[current] = max(0, totals[current] - 1)
-        totals.setdefault(new_status, 0)
-        totals[new_status] += 1
+    def compact_progress(self) -> None:
+        """Fold the status journal into progress.json and start a fresh journal.
 
-        samples[sample_id] = new_status
-        progress["updated_at"] = utc_now()
+        The journal is renamed before it is read, so transitions appended concurrently (e.g. by
+        other shards of the same batch) land in a new journal instead of being dropped.
+        """
+
+        if not self.progress_journal_path.exists():
+            return
+        folding = self.progress_journal_path.with_name(f"{self.progress_journal_path.name}.{os.getpid()}")
+        self.progress_journal_path.replace(folding)
+        progress = self.load_progress()
         io.write_json(self.progress_path, progress)
+        folding.unlink(missing_ok=True)
+
+    def _append_status_entries(self, entries: List[Dict[str, object]]) -> None:
+        if not self._journal_checked:
+            # A crash can leave a torn last line; terminate it so our first entry is not glued onto it.
+            try:
+                with self.progress_journal_path.open("rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            except (FileNotFoundError, OSError):
+                torn = False
+            if torn:
+                with self.progress_journal_path.open("ab") as f:
+                    f.write(b"\n")
+            self._journal_checked = True
+        io.append_jsonl(self.progress_journal_path, entries)
+
+    def _replay_journal(
+        self, progress: Dict[str, object], path: Path, *, start: int = 0
+    ) -> Tuple[Optional[int], int]:
+        """Apply the complete lines of `path` from byte `start`; return (inode, end offset)."""
+
+        try:
+            with path.open("rb") as f:
+                ino = os.fstat(f.fileno()).st_ino
+                f.seek(start)
+                data = f.read()
+        except FileNotFoundError:
+            return None, 0
+        # A line without its newline is torn or still being appended; it is picked up next time.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = io.loads(line)
+            except ValueError:
+                # Torn trailing append from an interrupted run.
+                continue
+            if not isinstance(entry, dict) or "sample_id" not in entry or "new_status" not in entry:
+                continue
+            _apply_status(progress, entry["sample_id"], entry["new_status"], entry.get("old_status"))
+            progress["updated_at"] = entry.get("updated_at") or progress.get("updated_at")
+        return ino, start + end
+
+    async def aupdate_status(
+        self,
+        sample_id: str,
+        *,
+        old_status: Optional[str] = None,
+        new_status: str,
+    ) -> None:
+        """`update_status` on a worker thread, for callers running inside an event loop."""
+
+        await asyncio.to_thread(self.update_status, sample_id, old_status=old_status, new_status=new_status)
 
     def get_status(self, sample_id: str) -> Optional[str]:
         """Return current status for a sample."""
 
-        progress = self.load_progress()
-        return progress["samples"].get(sample_id)
+        return self._current_progress()["samples"].get(sample_id)
 
     def write_checkpoint(self, sample_id: str, payload: Dict[str, object]) -> None:
         """Write one per-sample checkpoint JSON."""
@@ -162,14 +313,34 @@ class BatchStateManager:
         payload["updated_at"] = utc_now()
         io.write_json(path, payload)
 
+    async def awrite_checkpoint(self, sample_id: str, payload: Dict[str, object]) -> None:
+        """`write_checkpoint` on a worker thread, for callers running inside an event loop."""
+
+        await asyncio.to_thread(self.write_checkpoint, sample_id, payload)
+
     def read_checkpoint(self, sample_id: str) -> Dict[str, object]:
         """Read one per-sample checkpoint; return a default structure if missing."""
 
         path = self.checkpoint_dir / f"{sample_id}.json"
-        if path.exists():
+        try:
             return io.read_json(path)
+        except FileNotFoundError:
+            pass
+        initial = self._load_initial_checkpoints().get(sample_id)
+        if initial is not None:
+            return dict(initial)
         return {"status": "pending", "updated_at": utc_now()}
 
+    def _load_initial_checkpoints(self) -> Dict[str, Dict[str, object]]:
+        if self._initial_checkpoints is None:
+            initial: Dict[str, Dict[str, object]] = {}
+            if self.initial_checkpoints_path.exists():
+                for rec in io.read_jsonl(self.initial_checkpoints_path):
+                    if isinstance(rec, dict):
+                        initial[rec.pop("sample_id", None)] = rec
+            self._initial_checkpoints = initial
+        return self._initial_checkpoints
+
     def iter_samples(
         self,
         statuses: Iterable[str],
@@ -178,8 +349,7 @@ class BatchStateManager:
     ) -> Iterator[str]:
         """Iterate sample ids filtered by status."""
 
-        progress = self.load_progress()
-        samples = progress["samples"]
+        samples = dict(self._current_progress()["samples"])
         wanted = set(statuses)
         count = 0
         for sample_id, status in samples.items():
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-import json
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+from .io import read_json
+
+try:  # optional dependency: incremental JSON parsing
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None
+
 
 @dataclass(frozen=True)
 class Article2Unit2StructureItem:
@@ -26,6 +33,33 @@ def _as_list(v: Any) -> List[Any]:
     return v if isinstance(v, list) else []
 
 
+def _iter_dataset_items(path: Path) -> Iterable[Any]:
+    """Yield the raw entries of a release file's top-level `items` list.
+
+    With ijson installed the entries are streamed one at a time, so the whole document is
+    never held in memory; otherwise (or if the streamed parse fails) the file is parsed at once.
+    """
+
+    if ijson is not None:
+        streamed = 0
+        try:
+            with Path(path).open("rb") as f:
+                for it in ijson.items(f, "items.item", use_float=True):
+                    streamed += 1
+                    yield it
+        except ijson.JSONError as exc:
+            if streamed:
+                raise ValueError(f"Invalid dataset JSON: {path}: {exc}") from exc
+        if streamed:
+            return
+        # Nothing streamed: empty, not the release format, or JSON that only the stdlib accepts.
+
+    payload = read_json(Path(path))
+    if not isinstance(payload, dict) or "items" not in payload:
+        raise ValueError(f"Unsupported dataset format (missing top-level 'items'): {path}")
+    yield from _as_list(payload.get("items"))
+
+
 def load_article2unit2structure_dataset(
     path: Path,
     *,
@@ -39,23 +73,20 @@ def load_article2unit2structure_dataset(
       {"items": [ {item_id, language, subset, source_type, input, gold}, ... ], ...}
     """
 
-    payload = json.loads(Path(path).read_text(encoding="utf-8"))
-    if not isinstance(payload, dict) or "items" not in payload:
-        raise ValueError(f"Unsupported dataset format (missing top-level 'items'): {path}")
-
     want_sub = {s for s in (subsets or []) if isinstance(s, str) and s.strip()}
     want_lang = {s for s in (languages or []) if isinstance(s, str) and s.strip()}
 
     out: List[Article2Unit2StructureItem] = []
-    for it in _as_list(payload.get("items")):
+    for it in _iter_dataset_items(Path(path)):
         if not isinstance(it, dict):
             continue
         item_id = str(it.get("item_id") or "").strip()
         if not item_id:
             continue
-        language = str(it.get("language") or "").strip()
-        subset = str(it.get("subset") or "").strip()
-        source_type = str(it.get("source_type") or "").strip()
+        # Low-cardinality labels: intern so every item shares one string object per value.
+        language = sys.intern(str(it.get("language") or "").strip())
+        subset = sys.intern(str(it.get("subset") or "").strip())
+        source_type = sys.intern(str(it.get("source_type") or "").strip())
         if want_sub and subset not in want_sub:
             continue
         if want_lang and language not in want_lang:
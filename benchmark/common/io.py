@@ -2,62 +2,167 @@
 
 We keep JSON/JSONL read/write behavior consistent across the repository and
 provide an atomic write utility to avoid partially-written files.
+
+`orjson` is used for parsing/serialization when installed; otherwise we fall
+back to the stdlib `json` module with the same output. (Under orjson,
+non-finite floats are written as `null` and exponents are spelled `1e16`
+rather than `1e+16`.) JSONL lines are always written compactly.
 """
 
 from __future__ import annotations
 
 import json
+import mmap
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Iterable, Iterator, List, Sequence
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - stdlib fallback if orjson isn't installed
+    orjson = None  # type: ignore[assignment]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or text."""
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than stdlib (NaN, lone surrogates, ...); keep stdlib semantics.
+            pass
+    return json.loads(data)
+
+
+def dumps(data: Any, *, indent: Optional[int] = None) -> str:
+    """Encode JSON text (non-ASCII kept as-is).
+
+    orjson only supports 2-space indentation; other indents use the stdlib encoder.
+    """
+
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Unsupported types / lone surrogates: let stdlib produce the same result (or error) as before.
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=indent)
+
+
+def _dumps_bytes(data: Any, *, indent: Optional[int]) -> bytes:
+    """`dumps` encoded as UTF-8, skipping the str round-trip when orjson handles it."""
+
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def jsonl_line(record: Any) -> bytes:
+    """Encode one compact JSONL line as UTF-8 bytes, including the trailing newline."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# Files at least this large are memory-mapped for decoding instead of read into a bytes copy.
+_MMAP_MIN_BYTES = 1 << 20
 
 
 def read_json(path: Path) -> Any:
     """Read a JSON file and return the decoded Python object."""
 
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    if orjson is not None:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                # orjson decodes straight from the page cache; no private copy of the file is made.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass  # re-read below so the stdlib fallback in `loads` applies
+    return loads(path.read_bytes())
 
 
 def write_json(path: Path, data: Any, *, indent: int = 2) -> None:
     """Write a JSON file (pretty-printed by default)."""
 
-    _atomic_write(path, json.dumps(data, ensure_ascii=False, indent=indent))
+    _atomic_write_bytes(path, _dumps_bytes(data, indent=indent))
+
+
+def write_json_array(path: Path, records: Iterable[Any]) -> None:
+    """Stream a JSON array to `path` with the same bytes as `write_json(path, list(records))`.
+
+    Records are encoded one at a time into the temp file, so the list is never materialized.
+    """
+
+    with _atomic_open(path) as f:
+        sep = b"[\n  "
+        for record in records:
+            # Encoded strings never contain raw newlines, so re-indenting line by line is exact.
+            f.write(sep + _dumps_bytes(record, indent=2).replace(b"\n", b"\n  "))
+            sep = b",\n  "
+        f.write(b"[]" if sep == b"[\n  " else b"\n]")
 
 
 def read_jsonl(path: Path) -> Iterator[Any]:
     """Read a JSONL file line-by-line."""
 
-    with path.open("r", encoding="utf-8") as f:
+    with path.open("rb") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            yield json.loads(line)
+            yield loads(line)
 
 
-def write_jsonl(path: Path, records: Sequence[Any]) -> None:
-    """Write a JSONL file in one shot."""
+def write_jsonl(path: Path, records: Iterable[Any]) -> None:
+    """Write a JSONL file atomically, encoding one record at a time (the payload is never joined)."""
 
-    payload = "\n".join(json.dumps(record, ensure_ascii=False) for record in records)
-    if payload:
-        payload += "\n"
-    _atomic_write(path, payload)
+    with _atomic_open(path) as f:
+        for record in records:
+            f.write(jsonl_line(record))
 
 
 def append_jsonl(path: Path, records: Iterable[Any]) -> None:
     """Append records to a JSONL file."""
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        for record in records:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    with path.open("ab") as f:
+        f.write(b"".join(jsonl_line(record) for record in records))
 
 
 def _atomic_write(path: Path, payload: str) -> None:
     """Write via a temp file to avoid corrupting outputs on partial writes."""
 
+    _atomic_write_bytes(path, payload.encode("utf-8"))
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> None:
+    """Byte-level `_atomic_write`."""
+
+    with _atomic_open(path) as f:
+        f.write(payload)
+
+
+@contextmanager
+def _atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Binary temp file that replaces `path` on success and is removed on error."""
+
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = path.with_suffix(path.suffix + ".tmp")
-    with tmp_path.open("w", encoding="utf-8") as f:
-        f.write(payload)
+    try:
+        with tmp_path.open("wb") as f:
+            yield f
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
     tmp_path.replace(path)
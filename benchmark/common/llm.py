@@ -7,6 +7,7 @@ See `benchmark/common/model_config.py`.
 from __future__ import annotations
 
 import asyncio
+import random
 import re
 import time
 from dataclasses import dataclass
@@ -24,14 +25,69 @@ FINAL_PATTERN = re.compile(r"<final>([\s\S]*?)</final>", re.IGNORECASE)
 
 FinalParser = Optional[Callable[[str], Optional[str]]]
 
+# HTTP statuses that mean "slow down" rather than "this request is broken".
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+MAX_RETRY_SLEEP_SEC = 30.0
+
 
 def extract_final_block(text: str) -> Optional[str]:
     """Extract the content of the last `<final>...</final>` block, if present."""
 
-    matches = FINAL_PATTERN.findall(text)
-    if not matches:
+    # Only the last block is used: walk the matches without collecting every capture.
+    last = None
+    for last in FINAL_PATTERN.finditer(text):
+        pass
+    if last is None:
         return None
-    return matches[-1].strip()
+    return last.group(1).strip()
+
+
+class _AimdLimiter:
+    """Concurrency cap that adapts to provider throttling (additive increase, multiplicative decrease).
+
+    Starts at `max_concurrency`; a throttling event halves the window, and each success grows it
+    by roughly one slot per window's worth of successes, back up to `max_concurrency`.
+
+    Entering yields the current decrease epoch. Requests admitted before the last decrease were
+    already accounted for by it, so a burst of concurrent 429s halves the window once, not once
+    per response.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._max = max(1, int(max_concurrency))
+        self._window = float(self._max)
+        self._in_flight = 0
+        self._epoch = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._window))
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            return self._epoch
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        if self._window < self._max:
+            self._window = min(float(self._max), self._window + 1.0 / self._window)
+
+    def on_throttle(self, admitted_epoch: int) -> None:
+        if admitted_epoch != self._epoch:
+            return
+        self._window = max(1.0, self._window / 2.0)
+        self._epoch += 1
+
+
+def _is_throttle_error(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) in THROTTLE_STATUS_CODES
 
 
 @dataclass
@@ -78,7 +134,7 @@ class AsyncLLMClient:
             max_retries=sdk_max_retries,
         )
         self._timeout = request_timeout
-        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiter = _AimdLimiter(max_concurrency)
         self._retries = max(1, int(retries))
         self._retry_backoff_sec = float(retry_backoff_sec)
         self._default_final_parser: FinalParser = final_parser
@@ -102,34 +158,42 @@ class AsyncLLMClient:
     ) -> LLMResponse:
         """Run one chat completion request and parse `<final>` if present."""
 
-        params = dict(self._defaults)
-        if temperature is not None:
-            params["temperature"] = temperature
-        if extra_params:
-            params.update(extra_params)
+        # The defaults are only copied when this call overrides something (they are splatted, never mutated).
+        params: Mapping[str, Any] = self._defaults
+        if temperature is not None or extra_params:
+            params = dict(self._defaults)
+            if temperature is not None:
+                params["temperature"] = temperature
+            if extra_params:
+                params.update(extra_params)
+        request_messages = messages if isinstance(messages, list) else list(messages)
 
         # Application-layer retry control.
-        max_attempts = max(1, int(retries if retries is not None else self._retries))
-        backoff = float(retry_backoff_sec if retry_backoff_sec is not None else self._retry_backoff_sec)
+        max_attempts = self._retries if retries is None else max(1, int(retries))
+        backoff = self._retry_backoff_sec if retry_backoff_sec is None else float(retry_backoff_sec)
         last_err: Optional[BaseException] = None
         start_ts = time.perf_counter()
         response = None
         for attempt in range(1, max_attempts + 1):
+            admitted = -1
             try:
-                async with self._semaphore:
+                async with self._limiter as admitted:
                     response = await self._client.chat.completions.create(
                         model=self._model,
-                        messages=list(messages),
+                        messages=request_messages,
                         timeout=self._timeout,
                         **params,
                     )
+                self._limiter.on_success()
                 break
             except Exception as e:  # noqa: BLE001 - network/service errors trigger retries
                 last_err = e
+                if _is_throttle_error(e):
+                    self._limiter.on_throttle(admitted)
                 if attempt >= max_attempts:
                     raise
-                # Linear backoff (could be exponential) to avoid retry storms under high concurrency.
-                await asyncio.sleep(backoff * attempt)
+                # Full-jitter exponential backoff: spreads out retries that failed together.
+                await asyncio.sleep(random.uniform(0.0, min(MAX_RETRY_SLEEP_SEC, backoff * 2 ** (attempt - 1))))
         latency = time.perf_counter() - start_ts
 
         content = response.choices[0].message.content or ""
@@ -2,15 +2,17 @@
 
 Provides:
   - a uniform log format
-  - file logging with rotation
+  - file logging with rotation (written by a background listener thread)
   - lightweight context binding (batch_id/sample_id/stage)
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.config
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -24,6 +26,8 @@ DEFAULT_LOG_FORMAT = (
     "%(asctime)s | %(levelname)s | %(stage)s | %(batch_id)s | %(sample_id)s | %(message)s"
 )
 
+_listener: Optional[QueueListener] = None
+
 
 class _ContextFilter(logging.Filter):
     """Ensure all log records contain the expected extra fields."""
@@ -116,8 +120,35 @@ def setup_logging(
         },
     }
 
+    _stop_listener()
     logging.config.dictConfig(logging_config)
 
+    # Callers (including the asyncio event loop) only enqueue records; the configured handlers
+    # format and write them on a listener thread.
+    global _listener
+    root = logging.getLogger()
+    sinks = list(root.handlers)
+    for handler in sinks:
+        root.removeHandler(handler)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread (no-op if logging was never set up)."""
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def get_logger(name: Optional[str] = None, **context: str) -> ContextLoggerAdapter:
     """Get a logger with context binding.
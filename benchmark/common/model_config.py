@@ -29,12 +29,14 @@ Backward compatibility:
 
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Mapping, Optional, Tuple
 
+from .io import read_json
+
 
 DEFAULT_CHAT_PARAMS: Dict[str, Any] = {
     # Keep conservative defaults; benchmark scripts may override per-run.
@@ -56,7 +58,7 @@ def _as_dict(v: Any) -> Dict[str, Any]:
     return v if isinstance(v, dict) else {}
 
 
-def load_model_registry(path: Optional[Path] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+def load_model_registry(path: Optional[os.PathLike | str] = None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
     """Load (defaults, models) from a JSON config file.
 
     Returns:
@@ -66,14 +68,25 @@ def load_model_registry(path: Optional[Path] = None) -> Tuple[Dict[str, Any], Di
     """
 
     if path is None:
-        env_path = (os.environ.get("NORMBENCH_MODEL_CONFIG") or "").strip()
-        path = Path(env_path) if env_path else None
+        # A bare str is enough here; the path only feeds os.path/os.stat and the cache key.
+        path = (os.environ.get("NORMBENCH_MODEL_CONFIG") or "").strip() or None
 
     if path is None:
         # No config file provided; still allow pure env-based routing (OPENAI_BASE_URL/KEY).
         return dict(DEFAULT_CHAT_PARAMS), {}
 
-    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    path_str = os.path.abspath(path)
+    st = os.stat(path_str)
+    # Parsed once per file version; callers get their own top-level dicts to mutate.
+    defaults, models = _load_registry_cached(path_str, st.st_mtime_ns, st.st_size)
+    return dict(defaults), {alias: dict(cfg) for alias, cfg in models.items()}
+
+
+@lru_cache(maxsize=8)
+def _load_registry_cached(
+    path: str, mtime_ns: int, size: int
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    payload = read_json(Path(path))
     if not isinstance(payload, dict):
         raise ValueError(f"Model config must be a JSON object: {path}")
 
@@ -107,16 +120,17 @@ def _resolve_field_from_env(cfg: Mapping[str, Any], *, field: str, env_field: st
     env_name = str(cfg.get(env_field) or "").strip()
     if not env_name:
         return ""
-    return str(os.environ.get(env_name) or "").strip()
+    return (os.environ.get(env_name) or "").strip()
 
 
 def resolve_model_config(alias: str, *, defaults: Dict[str, Any], models: Dict[str, Dict[str, Any]]) -> ModelConfig:
     """Resolve one model alias to a concrete routing config."""
 
     a = (alias or "").strip()
-    if a not in models:
-        raise KeyError(f"Model alias not found: `{a}`.")
-    cfg = models.get(a) or {}
+    try:
+        cfg = models[a] or {}
+    except KeyError:
+        raise KeyError(f"Model alias not found: `{a}`.") from None
 
     cfg_type = str(cfg.get("type") or "").strip()
     if cfg_type and cfg_type != "llm_api":